@@ -3,15 +3,80 @@ import msal
 import requests
 import os
 import config
+import task_store
+import task_model
+import perf_trace
 import atexit
+import contextvars
 import ctypes
 import json
+from datetime import datetime
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import queue
+import random
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
 from ctypes import wintypes
 
 CACHEFILE = "tokencache.bin"
 PLAN_CACHE_FILE = "plan_cache.json"
+TASK_SYNC_FILE = "task_sync.json"
+BUCKET_CACHE_FILE = "bucket_cache.json"
+BUCKET_CACHE_TTL_S = 24 * 3600
+BATCH_MAX_REQUESTS = 20
+
+# Kérés-ütemező: bérlőnkénti token bucket, 429/503 esetén Retry-After / jitteres backoff.
+REQUEST_RATE_PER_S = 8.0
+REQUEST_BURST = 16
+REQUEST_MAX_RETRIES = 4
+REQUEST_MAX_BACKOFF_S = 30.0
+PRIORITY_USER = 0
+PRIORITY_BACKGROUND = 1
+
+# Lapozás: Prefer: odata.maxpagesize (None = szerver alapértelmezés), és hány
+# letöltött, de még fel nem dolgozott oldal lehet egyszerre a sorban.
+PAGE_SIZE: int | None = None
+PAGE_MAX_IN_FLIGHT = 2
 session = requests.Session()
 
+# Planner delta (csak beta végponton érhető el). A deltaLink-et és a helyi
+# feladatkészletet a task_store tartja, így frissítéskor csak a változások jönnek le (és íródnak ki).
+# A TASK_SYNC_FILE a korábbi, JSON-alapú állapot: betöltéskor már csak eltakarítjuk.
+_DELTA_ENDPOINT = "https://graph.microsoft.com/beta/me/planner/all/delta"
+_TASK_ODATA_TYPE = "#microsoft.graph.plannerTask"
+_TASK_FIELDS = (
+    "id", "title", "percentComplete", "dueDateTime", "priority",
+    "planId", "bucketId", "assignments", "orderHint", "@odata.etag",
+)
+# Lejárt / érvénytelen deltaLink -> teljes újraszinkron; ezek a kódok a végpont hiányát jelzik
+# -> a munkamenet hátralevő részében a régi, teljes letöltés. Más hiba (429, 5xx, 401) csak hiba.
+_DELTA_RESYNC_STATUSES = (400, 404, 410)
+_DELTA_UNSUPPORTED_STATUSES = (400, 403, 404, 501)
+_SYNC_LOCK = threading.Lock()
+_task_sync_state: dict | None = None
+
+# home_account_id -> {"id", "displayName"}; a plan cache "__identity" kulcsa alatt is tároljuk
+_IDENTITY_KEY = "__identity"
+_IDENTITY_LOCK = threading.Lock()
+_identity_cache: dict[str, dict] | None = None
+
+# Nem elérhető (403/404) tervek: planId -> időbélyeg, hogy ne kérdezzük le minden induláskor
+_INACCESSIBLE_KEY = "__inaccessible"
+PLAN_NEGATIVE_TTL_S = 7 * 24 * 3600
+PLAN_LOOKUP_WORKERS = 4
+_PLAN_CACHE_LOCK = threading.RLock()
+
+# planId -> {"fetched_at", "etags": {bucketId: etag}, "buckets": [{"id", "name"}]}
+_BUCKET_LOCK = threading.Lock()
+_bucket_cache: dict | None = None
+
+# endpoint -> @odata.etag; a fetch_data és a "return=representation" válaszok töltik,
+# így a PATCH/DELETE előtt nem kell külön GET.
+_ETAG_CACHE: dict[str, str] = {}
+
 
 class DATABLOB(ctypes.Structure):
     _fields_ = [("cbData", wintypes.DWORD),
@@ -98,6 +163,49 @@ def _save_plan_cache(cache_data: dict) -> None:
         pass
 
 
+def _load_bucket_cache() -> dict:
+    if not os.path.exists(BUCKET_CACHE_FILE):
+        return {}
+    try:
+        with open(BUCKET_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f) or {}
+    except Exception:
+        return {}
+
+
+def _save_bucket_cache(cache_data: dict) -> None:
+    try:
+        with open(BUCKET_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(cache_data, f, ensure_ascii=False, indent=2)
+    except Exception:
+        pass
+
+
+def _update_plan_cache(mutate) -> None:
+    # Több szál is írhatja (tervek, azonosító) -> mindig friss betöltés + módosítás + mentés zár alatt
+    with _PLAN_CACHE_LOCK:
+        plan_cache = _load_plan_cache()
+        mutate(plan_cache)
+        _save_plan_cache(plan_cache)
+
+
+def _load_task_sync() -> dict:
+    if os.path.exists(TASK_SYNC_FILE):
+        try:
+            os.remove(TASK_SYNC_FILE)
+        except Exception:
+            pass
+    delta_link, tasks = task_store.load_delta()
+    if not delta_link:
+        return {}
+    return {"deltaLink": delta_link, "tasks": tasks}
+
+
+def _save_task_sync(state: dict, changed_ids, replace: bool = False) -> None:
+    # Csak a változott nyers sorok és a deltaLink íródnak ki, egy tranzakcióban
+    task_store.save_delta(state["deltaLink"], state["tasks"], changed_ids, replace)
+
+
 _TOKEN_CACHE = msal.SerializableTokenCache()
 _cache_text = _load_cache_text()
 if _cache_text:
@@ -106,28 +214,74 @@ if _cache_text:
 atexit.register(lambda: _save_cache_text(_TOKEN_CACHE.serialize()) if _TOKEN_CACHE.has_state_changed else None)
 
 
+# Egyetlen, hosszú életű MSAL alkalmazás (az authority discovery csak egyszer fut le),
+# és a memóriában tartott access token, amit csak lejárat előtt frissítünk.
+_MSAL_APP = None
+_MSAL_LOCK = threading.Lock()
+_TOKEN_LOCK = threading.Lock()
+_TOKEN_REFRESH_MARGIN_S = 300
+_token_holder: dict = {"token": None, "expires_at": 0.0, "account_id": None}
+
+
 def _msal_app_and_cache():
-    app = msal.PublicClientApplication(
-        config.CLIENT_ID,
-        authority=f"https://login.microsoftonline.com/{config.TENANT_ID}",
-        token_cache=_TOKEN_CACHE
-    )
-    return app, _TOKEN_CACHE
+    global _MSAL_APP
+    if _MSAL_APP is None:
+        with _MSAL_LOCK:
+            if _MSAL_APP is None:
+                _MSAL_APP = msal.PublicClientApplication(
+                    config.CLIENT_ID,
+                    authority=f"https://login.microsoftonline.com/{config.TENANT_ID}",
+                    token_cache=_TOKEN_CACHE
+                )
+    return _MSAL_APP, _TOKEN_CACHE
+
+
+def _hold_token(result: dict, account_id: str | None) -> None:
+    try:
+        expires_in = float(result.get("expires_in") or 0)
+    except Exception:
+        expires_in = 0.0
+    _token_holder["token"] = result["access_token"]
+    _token_holder["expires_at"] = time.time() + expires_in
+    _token_holder["account_id"] = account_id
+
+
+def _clear_token_holder() -> None:
+    with _TOKEN_LOCK:
+        _token_holder["token"] = None
+        _token_holder["expires_at"] = 0.0
+        _token_holder["account_id"] = None
+
+
+def _held_token() -> str | None:
+    if _token_holder["token"] and time.time() < _token_holder["expires_at"] - _TOKEN_REFRESH_MARGIN_S:
+        return _token_holder["token"]
+    return None
 
 
 def get_access_token_silent():
-    try:
-        app, _cache = _msal_app_and_cache()
-        accounts = app.get_accounts()
-        if not accounts:
+    token = _held_token()
+    if token:
+        return token
+
+    # Egyszerre csak egy szál frissít, a többi megvárja és a friss tokent kapja
+    with _TOKEN_LOCK:
+        token = _held_token()
+        if token:
+            return token
+        try:
+            app, _cache = _msal_app_and_cache()
+            accounts = app.get_accounts()
+            if not accounts:
+                return None
+            result = app.acquire_token_silent(config.SCOPES, account=accounts[0])
+            if result and "access_token" in result:
+                _hold_token(result, accounts[0].get("home_account_id"))
+                return result["access_token"]
+            return None
+        except Exception as e:
+            print(f"Silent token hiba: {e}")
             return None
-        result = app.acquire_token_silent(config.SCOPES, account=accounts[0])
-        if result and "access_token" in result:
-            return result["access_token"]
-        return None
-    except Exception as e:
-        print(f"Silent token hiba: {e}")
-        return None
 
 
 def get_access_token_interactive():
@@ -137,6 +291,10 @@ def get_access_token_interactive():
         if result and "access_token" in result:
             if cache.has_state_changed:
                 _save_cache_text(cache.serialize())
+            _clear_token_holder()
+            with _TOKEN_LOCK:
+                _hold_token(result, None)
+            _prime_identity(result)
             return result["access_token"]
         return None
     except Exception as e:
@@ -158,74 +316,617 @@ def logout():
         print(f"Memória cache törlési hiba: {e}")
         success = False
 
-    # 2. Töröljük a fájlt is
+    # 2. Az azonosító cache és a memóriában tartott token is a fiókhoz tartozik
+    _clear_token_holder()
+    _clear_identity()
+
+    # 3. Töröljük a fájlt is
     if os.path.exists(CACHEFILE):
         try:
             os.remove(CACHEFILE)
         except Exception as e:
             print(f"Logout fájl törlési hiba: {e}")
             success = False
-            
+
+    # 4. A helyi feladat-tár is
+    task_store.clear()
+
+    # 5. Bucket cache
+    global _bucket_cache
+    with _BUCKET_LOCK:
+        _bucket_cache = {}
+        if os.path.exists(BUCKET_CACHE_FILE):
+            try:
+                os.remove(BUCKET_CACHE_FILE)
+            except Exception as e:
+                print(f"Bucket cache törlési hiba: {e}")
+
+    # 6. A delta állapot a felhasználóhoz tartozik (a task_store-ral együtt törlődött),
+    # a következő bejelentkezés teljes szinkronnal indul
+    global _task_sync_state
+    with _SYNC_LOCK:
+        _task_sync_state = None
+        if os.path.exists(TASK_SYNC_FILE):
+            try:
+                os.remove(TASK_SYNC_FILE)
+            except Exception as e:
+                print(f"Delta állapot törlési hiba: {e}")
+
     return success
 
 
-def _planner_api_call(method: str, endpoint: str, payload=None, needs_etag=False):
+# Kooperatív megszakítás: a hívó egy CancelToken-t ad a cancel_scope-pal, a backend a kérések,
+# oldalak és várakozások határán ellenőrzi. A már futó szinkron HTTP olvasást nem szakítja félbe
+# (timeout=15 s), de az eredménye eldobódik; az asyncio úton a kérés maga is megszakad.
+CANCELLED_MSG = "Megszakítva"
+CANCEL_POLL_S = 0.2
+
+
+class Cancelled(Exception):
+    """A hívó visszavonta a kérést (újabb kérés, kijelentkezés vagy bezárás)."""
+
+
+class CancelToken:
+    """Visszavonás jelzése, és az utolsó haladás ideje (válasz, oldal, kivárt throttling)."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self.last_progress = time.monotonic()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def touch(self) -> None:
+        self.last_progress = time.monotonic()
+
+    def idle_s(self) -> float:
+        """Az utolsó haladás óta eltelt idő másodpercben (elakadás-figyeléshez)."""
+        return time.monotonic() - self.last_progress
+
+
+_cancel_token: contextvars.ContextVar = contextvars.ContextVar("planner_cancel_token", default=None)
+
+
+def current_cancel_token() -> CancelToken | None:
+    return _cancel_token.get()
+
+
+@contextmanager
+def cancel_scope(token: CancelToken | None):
+    reset = _cancel_token.set(token)
+    try:
+        yield token
+    finally:
+        _cancel_token.reset(reset)
+
+
+def check_cancelled() -> None:
+    token = _cancel_token.get()
+    if token is not None and token.cancelled:
+        raise Cancelled()
+
+
+def report_progress() -> None:
+    token = _cancel_token.get()
+    if token is not None:
+        token.touch()
+
+
+class _RequestScheduler:
+    """Központi ütemező minden Graph híváshoz.
+
+    - bérlőnkénti token bucket (REQUEST_RATE_PER_S / REQUEST_BURST),
+    - 429/503 esetén Retry-After (vagy jitteres exponenciális backoff) szerinti várakozás,
+      ami az egész bérlőre vonatkozik,
+    - a háttér (PRIORITY_BACKGROUND) kérések kivárják a felhasználói írásokat.
+    """
+
+    def __init__(self, rate_per_s: float, burst: int, max_retries: int) -> None:
+        self.rate_per_s = float(rate_per_s)
+        self.burst = float(burst)
+        self.max_retries = int(max_retries)
+        self._cond = threading.Condition()
+        self._buckets: dict[str, list[float]] = {}
+        self._blocked_until: dict[str, float] = {}
+        self._user_waiting = 0
+        self._stats = {"requests": 0, "throttled": 0, "retried": 0, "dropped": 0}
+
+    def stats(self) -> dict:
+        with self._cond:
+            return dict(self._stats)
+
+    def count(self, key: str, n: int = 1) -> None:
+        with self._cond:
+            self._stats[key] += n
+
+    def acquire(self, tenant: str, priority: int) -> None:
+        token = current_cancel_token()
+        with self._cond:
+            if priority == PRIORITY_USER:
+                self._user_waiting += 1
+            try:
+                while True:
+                    if token is not None and token.cancelled:
+                        raise Cancelled()
+                    now = time.monotonic()
+                    if priority != PRIORITY_USER and self._user_waiting > 0:
+                        self._cond.wait(0.05)
+                        continue
+
+                    tokens, last = self._buckets.get(tenant, [self.burst, now])
+                    tokens = min(self.burst, tokens + (now - last) * self.rate_per_s)
+                    blocked = self._blocked_until.get(tenant, 0.0) - now
+
+                    if blocked <= 0 and tokens >= 1.0:
+                        self._buckets[tenant] = [tokens - 1.0, now]
+                        return
+                    self._buckets[tenant] = [tokens, now]
+                    if token is not None:
+                        # Retry-After / token bucket kivárása nem elakadás
+                        token.touch()
+                    wait_s = max(blocked, (1.0 - tokens) / self.rate_per_s, 0.01)
+                    # Megszakítható hívónál egy Retry-After várakozás se tartsa fel sokáig
+                    self._cond.wait(min(wait_s, CANCEL_POLL_S) if token is not None else wait_s)
+            finally:
+                if priority == PRIORITY_USER:
+                    self._user_waiting -= 1
+                    self._cond.notify_all()
+
+    def block(self, tenant: str, delay_s: float) -> None:
+        with self._cond:
+            until = time.monotonic() + max(0.0, delay_s)
+            if until > self._blocked_until.get(tenant, 0.0):
+                self._blocked_until[tenant] = until
+            self._cond.notify_all()
+
+    def backoff_delay(self, retry_after: float | None, attempt: int) -> float:
+        if retry_after is not None:
+            return min(REQUEST_MAX_BACKOFF_S, retry_after)
+        base = min(REQUEST_MAX_BACKOFF_S, 1.0 * (2 ** attempt))
+        return base * random.uniform(0.5, 1.0)
+
+    def should_retry(self, tenant: str, res, attempt: int) -> bool:
+        """Válasz utáni könyvelés; True, ha a kérést (várakozás után) újra kell küldeni."""
+        self.count("requests")
+        if res.status_code not in (429, 503):
+            return False
+
+        self.count("throttled")
+        if attempt >= self.max_retries:
+            self.count("dropped")
+            return False
+        self.block(tenant, self.backoff_delay(_retry_after_seconds(res.headers), attempt))
+        self.count("retried")
+        return True
+
+    def send(self, method: str, url: str, headers: dict, payload=None, priority: int = PRIORITY_USER):
+        tenant = config.TENANT_ID
+        attempt = 0
+        while True:
+            self.acquire(tenant, priority)
+            res = _send_raw(method, url, headers, payload)
+            check_cancelled()
+            report_progress()
+            if not self.should_retry(tenant, res, attempt):
+                return res
+            attempt += 1
+
+
+def _retry_after_seconds(headers) -> float | None:
+    raw = (headers or {}).get("Retry-After")
+    if raw is None:
+        return None
+    raw = str(raw).strip()
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(raw).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+_SCHEDULER = _RequestScheduler(REQUEST_RATE_PER_S, REQUEST_BURST, REQUEST_MAX_RETRIES)
+
+
+def get_request_stats() -> dict:
+    """Ütemező számlálók: requests / throttled / retried / dropped."""
+    return _SCHEDULER.stats()
+
+
+def _planner_api_call(method: str, endpoint: str, payload=None, needs_etag=False, extra_headers: dict | None = None,
+                      priority: int | None = None):
     token = get_access_token_silent()
     if not token:
         return False, "Nincs bejelentkezve", None
 
-    url = f"https://graph.microsoft.com/v1.0{endpoint}"
+    if endpoint.startswith("https://"):
+        url = endpoint
+    else:
+        url = f"https://graph.microsoft.com/v1.0{endpoint}"
     headers = {
         "Authorization": f"Bearer {token}",
         "Content-Type": "application/json",
         "Cache-Control": "no-cache"
     }
+    if extra_headers:
+        headers.update(extra_headers)
+    if priority is None:
+        priority = PRIORITY_BACKGROUND if method == "GET" else PRIORITY_USER
 
     try:
         if needs_etag:
-            get_res = session.get(url, headers={"Authorization": f"Bearer {token}", "Cache-Control": "no-cache"}, timeout=15)
-            if get_res.status_code != 200:
-                return False, f"ETag hiba: {get_res.status_code} - {get_res.text}", None
-            etag = get_res.json().get("@odata.etag")
+            etag = _ETAG_CACHE.get(endpoint)
             if not etag:
-                return False, "Hiányzó ETag", None
+                etag, err = _fetch_etag(url, token, priority)
+                if not etag:
+                    return False, err, None
             headers["If-Match"] = etag
             headers["Prefer"] = "return=representation"
 
-        if method == "GET":
-            res = session.get(url, headers=headers, timeout=15)
-        elif method == "POST":
-            res = session.post(url, headers=headers, json=payload, timeout=15)
-        elif method == "PATCH":
-            res = session.patch(url, headers=headers, json=payload, timeout=15)
-        elif method == "DELETE":
-            res = session.delete(url, headers=headers, timeout=15)
-        else:
+        if method not in ("GET", "POST", "PATCH", "DELETE"):
             return False, "Ismeretlen metódus", None
+        res = _send(method, url, headers, payload, priority)
+
+        if needs_etag and res.status_code == 412:
+            # Elavult ETag a cache-ben: egyszer frissítjük és újrapróbáljuk
+            _ETAG_CACHE.pop(endpoint, None)
+            etag, err = _fetch_etag(url, token, priority)
+            if not etag:
+                return False, err, None
+            headers["If-Match"] = etag
+            res = _send(method, url, headers, payload, priority)
 
         if res.status_code in (200, 201, 204):
+            _remember_etag(method, endpoint, res)
             return True, "", res
         return False, f"API hiba: {res.status_code} - {res.text}", res
+    except Cancelled:
+        return False, CANCELLED_MSG, None
     except Exception as e:
         return False, f"Hálózati hiba: {e}", None
 
 
-def get_my_user_id(token: str):
-    if not token:
-        return None
-    url = "https://graph.microsoft.com/v1.0/me"
-    headers = {"Authorization": f"Bearer {token}"}
+def _send(method: str, url: str, headers: dict, payload=None, priority: int = PRIORITY_USER):
+    return _SCHEDULER.send(method, url, headers, payload, priority)
+
+
+def _send_raw(method: str, url: str, headers: dict, payload=None):
+    if not perf_trace.ENABLED:
+        return _http(method, url, headers, payload)
+    t0 = time.perf_counter_ns()
+    res = _http(method, url, headers, payload)
+    _trace_response(time.perf_counter_ns() - t0, payload, res)
+    return res
+
+
+def _http(method: str, url: str, headers: dict, payload=None):
+    if method == "GET":
+        return session.get(url, headers=headers, timeout=15)
+    if method == "POST":
+        return session.post(url, headers=headers, json=payload, timeout=15)
+    if method == "PATCH":
+        return session.patch(url, headers=headers, json=payload, timeout=15)
+    return session.delete(url, headers=headers, timeout=15)
+
+
+def _trace_response(elapsed_ns: int, payload, res) -> None:
+    perf_trace.add_ns("network", elapsed_ns)
+    perf_trace.add("requests")
+    perf_trace.add("bytes_in", len(getattr(res, "content", b"") or b""))
+    if payload is not None:
+        perf_trace.add("bytes_out", len(json.dumps(payload, ensure_ascii=False).encode("utf-8")))
+
+
+def _fetch_etag(url: str, token: str, priority: int = PRIORITY_USER):
+    get_res = _send("GET", url, {"Authorization": f"Bearer {token}", "Cache-Control": "no-cache"}, priority=priority)
+    if get_res.status_code != 200:
+        return None, f"ETag hiba: {get_res.status_code} - {get_res.text}"
+    etag = get_res.json().get("@odata.etag")
+    if not etag:
+        return None, "Hiányzó ETag"
+    return etag, ""
+
+
+def _remember_etag(method: str, endpoint: str, res) -> None:
+    if method == "DELETE":
+        _ETAG_CACHE.pop(endpoint, None)
+        return
+    if endpoint.startswith("https://") or res.status_code == 204 or not res.content:
+        return
     try:
-        res = session.get(url, headers=headers, timeout=10)
-        if res.status_code == 200:
-            return res.json().get("id")
-        return None
+        body = res.json()
+    except Exception:
+        return
+    _remember_etag_body(method, endpoint, body)
+
+
+def _remember_etag_body(method: str, endpoint: str, body) -> None:
+    if method == "DELETE":
+        _ETAG_CACHE.pop(endpoint, None)
+        return
+    etag = body.get("@odata.etag") if isinstance(body, dict) else None
+    if not etag:
+        return
+    if method == "POST" and body.get("id"):
+        _ETAG_CACHE[f"{endpoint}/{body['id']}"] = etag
+    else:
+        _ETAG_CACHE[endpoint] = etag
+
+
+def iter_pages(endpoint: str, page_size: int | None = None, max_in_flight: int | None = None):
+    """Generator: az @odata.nextLink láncot követve oldalanként adja vissza a választ.
+
+    Minden elem (ok, msg, body, status). Hibánál egy (False, ...) elem után leáll.
+    A következő oldalak háttérszálon töltődnek, legfeljebb max_in_flight oldal előre.
+    """
+    page_size = PAGE_SIZE if page_size is None else page_size
+    max_in_flight = PAGE_MAX_IN_FLIGHT if max_in_flight is None else max_in_flight
+    headers = {"Prefer": f"odata.maxpagesize={int(page_size)}"} if page_size else None
+
+    pages: queue.Queue = queue.Queue(maxsize=max(1, int(max_in_flight)))
+    stop = threading.Event()
+    # Az új szál üres kontextussal indul: a hívóét (megszakítás-token, perf minta) átmásoljuk
+    token = current_cancel_token()
+    ctx = contextvars.copy_context()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def producer() -> None:
+        url = endpoint
+        try:
+            while url and not stop.is_set():
+                ok, msg, res = _planner_api_call("GET", url, extra_headers=headers)
+                status = getattr(res, "status_code", None)
+                if not ok:
+                    put((False, msg, None, status))
+                    return
+                with perf_trace.stage("parse"):
+                    body = res.json() or {}
+                if not put((True, "", body, status)):
+                    return
+                url = body.get("@odata.nextLink")
+        except Exception as e:
+            put((False, f"Hálózati hiba: {e}", None, None))
+            return
+        put(None)
+
+    threading.Thread(target=ctx.run, args=(producer,), daemon=True).start()
+    try:
+        while True:
+            try:
+                item = pages.get(timeout=CANCEL_POLL_S)
+            except queue.Empty:
+                # Megszakításkor nem várjuk meg a még futó HTTP kérést
+                if token is not None and token.cancelled:
+                    yield False, CANCELLED_MSG, None, None
+                    return
+                continue
+            if item is None:
+                return
+            yield item
+            if not item[0]:
+                return
+    finally:
+        stop.set()
+
+
+def _collect_values(endpoint: str):
+    out = []
+    for ok, msg, body, _status in iter_pages(endpoint):
+        if not ok:
+            return False, msg, out
+        out.extend(body.get("value", []) or [])
+    return True, "", out
+
+
+def _batch_chunks(items: list[dict]) -> list[list[int]]:
+    # A dependsOn láncnak egy batch-en belül kell maradnia -> összefüggő komponensekre bontunk
+    parent = list(range(len(items)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, it in enumerate(items):
+        for dep in it.get("dependsOn") or []:
+            if 0 <= dep < len(items):
+                parent[find(i)] = find(dep)
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(items)):
+        groups.setdefault(find(i), []).append(i)
+
+    chunks: list[list[int]] = []
+    current: list[int] = []
+    for group in groups.values():
+        if len(current) + len(group) > BATCH_MAX_REQUESTS:
+            if current:
+                chunks.append(current)
+            current = []
+        current.extend(group)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _batch_round(items: list[dict], indexes: list[int], results: list, priority: int) -> None:
+    if len(indexes) > BATCH_MAX_REQUESTS:
+        for i in indexes:
+            results[i] = (False, "Túl hosszú dependsOn lánc a batch-hez", 0, None)
+        return
+
+    requests_json = []
+    for i in indexes:
+        it = items[i]
+        method = it.get("method", "GET").upper()
+        sub = {"id": str(i), "method": method, "url": it["url"]}
+        headers = dict(it.get("headers") or {})
+        if it.get("body") is not None:
+            sub["body"] = it["body"]
+            headers.setdefault("Content-Type", "application/json")
+        if it.get("needs_etag"):
+            etag = _ETAG_CACHE.get(it["url"])
+            if etag:
+                headers["If-Match"] = etag
+            headers["Prefer"] = "return=representation"
+        if headers:
+            sub["headers"] = headers
+        deps = [str(d) for d in it.get("dependsOn") or [] if d in indexes]
+        if deps:
+            sub["dependsOn"] = deps
+        requests_json.append(sub)
+
+    if not requests_json:
+        return
+
+    ok, msg, res = _planner_api_call("POST", "/$batch", payload={"requests": requests_json}, priority=priority)
+    if not ok:
+        for sub in requests_json:
+            results[int(sub["id"])] = (False, msg, getattr(res, "status_code", 0), None)
+        return
+
+    for r in res.json().get("responses", []) or []:
+        try:
+            i = int(r.get("id"))
+        except Exception:
+            continue
+        status = int(r.get("status") or 0)
+        body = r.get("body")
+        if status in (429, 503):
+            results[i] = (False, f"API hiba: {status}", status, {"headers": r.get("headers") or {}})
+            continue
+        if 200 <= status < 300:
+            _remember_etag_body(items[i].get("method", "GET").upper(), items[i]["url"], body)
+            results[i] = (True, "", status, body)
+        else:
+            results[i] = (False, f"API hiba: {status} - {json.dumps(body, ensure_ascii=False) if body else ''}", status, body)
+
+
+def graph_batch(items: list[dict], retry_stale: bool = True) -> list[tuple]:
+    """Több Graph kérés JSON $batch-ben (max. 20 / POST).
+
+    Egy elem: {"method", "url", "body"?, "headers"?, "dependsOn"?: [index, ...], "needs_etag"?}.
+    Visszatérés a bemenettel azonos sorrendben: (ok, msg, status, body).
+    """
+    results: list = [(False, "Nincs válasz", 0, None)] * len(items)
+    if not items:
+        return results
+
+    # A hiányzó ETag-eket egyetlen előzetes GET batch-csel töltjük fel
+    missing = sorted({it["url"] for it in items if it.get("needs_etag") and it["url"] not in _ETAG_CACHE})
+    if missing:
+        graph_batch([{"method": "GET", "url": u} for u in missing])
+
+    reads_only = all(str(it.get("method", "GET")).upper() == "GET" for it in items)
+    priority = PRIORITY_BACKGROUND if reads_only else PRIORITY_USER
+
+    for chunk in _batch_chunks(items):
+        _batch_round(items, chunk, results, priority)
+
+    # A batch-en belül visszafogott elemeket az ütemező szerint kivárjuk és újraküldjük
+    for attempt in range(_SCHEDULER.max_retries + 1):
+        throttled = [i for i, r in enumerate(results) if r[2] in (429, 503)]
+        if not throttled:
+            break
+        _SCHEDULER.count("throttled", len(throttled))
+        if attempt == _SCHEDULER.max_retries:
+            _SCHEDULER.count("dropped", len(throttled))
+            break
+        waits = [_retry_after_seconds((results[i][3] or {}).get("headers")) for i in throttled]
+        waits = [w for w in waits if w is not None]
+        _SCHEDULER.block(config.TENANT_ID, _SCHEDULER.backoff_delay(max(waits) if waits else None, attempt))
+        _SCHEDULER.count("retried", len(throttled))
+
+        retry_items = [dict(items[i], dependsOn=None) for i in throttled]
+        sub_results: list = [None] * len(retry_items)
+        for chunk in _batch_chunks(retry_items):
+            _batch_round(retry_items, chunk, sub_results, priority)
+        for k, i in enumerate(throttled):
+            results[i] = sub_results[k]
+
+    # 412: elavult ETag -> egyszer frissítjük és újraküldjük az érintett elemeket
+    stale = [i for i, r in enumerate(results) if r[2] == 412 and items[i].get("needs_etag")]
+    if stale and retry_stale:
+        for i in stale:
+            _ETAG_CACHE.pop(items[i]["url"], None)
+        graph_batch([{"method": "GET", "url": u} for u in sorted({items[i]["url"] for i in stale})])
+        retry_items = [dict(items[i], dependsOn=None) for i in stale]
+        for i, r in zip(stale, graph_batch(retry_items, retry_stale=False)):
+            results[i] = r
+
+    return results
+
+
+def _current_account_id() -> str | None:
+    if _held_token() and _token_holder["account_id"]:
+        return _token_holder["account_id"]
+    try:
+        app, _cache = _msal_app_and_cache()
+        accounts = app.get_accounts()
+        if accounts:
+            return accounts[0].get("home_account_id")
     except Exception as e:
-        print(f"User ID lekérési hiba: {e}")
-        return None
+        print(f"Account lekérési hiba: {e}")
+    return None
 
 
-def get_my_display_name(token: str | None = None) -> str | None:
+def _identity_store() -> dict:
+    global _identity_cache
+    if _identity_cache is None:
+        stored = _load_plan_cache().get(_IDENTITY_KEY)
+        _identity_cache = dict(stored) if isinstance(stored, dict) else {}
+    return _identity_cache
+
+
+def _store_identity(account_id: str, ident: dict) -> None:
+    with _IDENTITY_LOCK:
+        _identity_store()[account_id] = ident
+        snapshot = dict(_identity_store())
+    _update_plan_cache(lambda plan_cache: plan_cache.__setitem__(_IDENTITY_KEY, snapshot))
+
+
+def _clear_identity() -> None:
+    global _identity_cache
+    with _IDENTITY_LOCK:
+        _identity_cache = {}
+    _update_plan_cache(lambda plan_cache: plan_cache.pop(_IDENTITY_KEY, None))
+
+
+def _prime_identity(result: dict) -> None:
+    # Bejelentkezés után az id_token claim-ekből töltjük, /me hívás nélkül
+    claims = result.get("id_token_claims") or {}
+    account_id = _current_account_id()
+    if not account_id or not claims.get("oid"):
+        return
+    _store_identity(account_id, {
+        "id": claims.get("oid"),
+        "displayName": (claims.get("name") or "").strip(),
+    })
+
+
+def _get_identity(token: str | None = None) -> dict | None:
+    account_id = _current_account_id()
+    if account_id:
+        with _IDENTITY_LOCK:
+            ident = _identity_store().get(account_id)
+        if ident and ident.get("id"):
+            return ident
+
     if not token:
         token = get_access_token_silent()
     if not token:
@@ -233,73 +934,253 @@ def get_my_display_name(token: str | None = None) -> str | None:
     url = "https://graph.microsoft.com/v1.0/me"
     headers = {"Authorization": f"Bearer {token}"}
     try:
-        res = session.get(url, headers=headers, timeout=10)
-        if res.status_code == 200:
-            return (res.json().get("displayName") or "").strip() or None
-        return None
+        res = _send("GET", url, headers, priority=PRIORITY_BACKGROUND)
+        if res.status_code != 200:
+            return None
+        data = res.json()
+        ident = {"id": data.get("id"), "displayName": (data.get("displayName") or "").strip()}
     except Exception as e:
-        print(f"DisplayName lekérési hiba: {e}")
+        print(f"Felhasználó lekérési hiba: {e}")
         return None
 
+    if account_id and ident.get("id"):
+        _store_identity(account_id, ident)
+    return ident
+
+
+def get_my_user_id(token: str):
+    if not token:
+        return None
+    ident = _get_identity(token)
+    return ident.get("id") if ident else None
+
+
+def get_my_display_name(token: str | None = None) -> str | None:
+    ident = _get_identity(token)
+    if not ident:
+        return None
+    return ident.get("displayName") or None
 
-def list_my_plans():
-    plans_dict = {}
-    plan_cache = _load_plan_cache()
-    cache_updated = False
-
-    ok_plans, msg_plans, res_plans = _planner_api_call("GET", "/me/planner/plans")
-    if ok_plans and res_plans:
-        for p in res_plans.json().get("value", []):
-            pid = p.get("id")
-            title = p.get("title", "")
-            if pid:
-                plans_dict[pid] = {"id": pid, "title": title}
-                if plan_cache.get(pid) != title:
-                    plan_cache[pid] = title
-                    cache_updated = True
-
-    ok_tasks, msg_tasks, res_tasks = _planner_api_call("GET", "/me/planner/tasks")
-    if ok_tasks and res_tasks:
-        for t in res_tasks.json().get("value", []):
-            pid = t.get("planId")
-            if pid and pid not in plans_dict:
-                if pid in plan_cache:
-                    plans_dict[pid] = {"id": pid, "title": plan_cache[pid]}
-                else:
-                    ok_single, msg_single, res_single = _planner_api_call("GET", f"/planner/plans/{pid}")
-                    if ok_single and res_single:
-                        p_data = res_single.json()
-                        title = p_data.get("title", "(Névtelen Terv)")
-                        plans_dict[pid] = {"id": pid, "title": title}
-                        plan_cache[pid] = title
-                        cache_updated = True
-
-    if cache_updated:
-        _save_plan_cache(plan_cache)
 
+def _async_backend():
+    # Az asyncio backend opcionális (httpx kell hozzá); nélküle a szinkron út fut
+    try:
+        import backend_async
+    except Exception:
+        return None
+    return backend_async if backend_async.AVAILABLE else None
+
+
+def _merge_plan_listing(plans_dict: dict, plan_cache: dict, plans: list) -> dict:
+    """A listázott tervek felvétele; a plan cache-ben megváltozott címeket adja vissza."""
+    changed = {}
+    for p in plans:
+        pid = p.get("id")
+        title = p.get("title", "")
+        if pid:
+            plans_dict[pid] = {"id": pid, "title": title}
+            if plan_cache.get(pid) != title:
+                changed[pid] = title
+    return changed
+
+
+def _is_plan_inaccessible(plan_cache: dict, pid: str) -> bool:
+    neg = plan_cache.get(_INACCESSIBLE_KEY)
+    ts = neg.get(pid) if isinstance(neg, dict) else None
+    try:
+        return ts is not None and time.time() - float(ts) < PLAN_NEGATIVE_TTL_S
+    except Exception:
+        return False
+
+
+def _unknown_plan_ids(plans_dict: dict, plan_cache: dict, tasks: list) -> list:
+    unknown = []
+    for t in tasks:
+        pid = t.get("planId")
+        if pid and pid not in plans_dict:
+            if isinstance(plan_cache.get(pid), str):
+                plans_dict[pid] = {"id": pid, "title": plan_cache[pid]}
+            elif pid not in unknown and not _is_plan_inaccessible(plan_cache, pid):
+                unknown.append(pid)
+    return unknown
+
+
+def _apply_plan_titles(plans_dict: dict, resolved: dict) -> None:
+    for pid, title in resolved.items():
+        plans_dict[pid] = {"id": pid, "title": title}
+
+
+def _persist_plan_lookups(resolved: dict, denied: list) -> None:
+    if not resolved and not denied:
+        return
+
+    def mutate(plan_cache: dict) -> None:
+        plan_cache.update(resolved)
+        neg = plan_cache.get(_INACCESSIBLE_KEY)
+        if not isinstance(neg, dict):
+            neg = {}
+        for pid in resolved:
+            neg.pop(pid, None)
+        now = time.time()
+        for pid in denied:
+            neg[pid] = now
+        if neg:
+            plan_cache[_INACCESSIBLE_KEY] = neg
+        else:
+            plan_cache.pop(_INACCESSIBLE_KEY, None)
+
+    _update_plan_cache(mutate)
+
+
+def _plans_result(plans_dict: dict):
     out = list(plans_dict.values())
     if out:
         return True, out
     return False, "Nem található egyetlen terv sem (esetleg hiányzó jogosultság)."
 
 
+def _resolve_plan_chunk(plan_ids: list) -> dict:
+    resolved = {}
+    denied = []
+    results = graph_batch([{"method": "GET", "url": f"/planner/plans/{pid}"} for pid in plan_ids])
+    for pid, (ok_single, _msg, status, p_data) in zip(plan_ids, results):
+        if ok_single and isinstance(p_data, dict):
+            resolved[pid] = p_data.get("title", "(Névtelen Terv)")
+        elif status in (403, 404):
+            denied.append(pid)
+    # Részeredmény azonnal a cache-be, így egy megszakadt betöltés sem vész el
+    _persist_plan_lookups(resolved, denied)
+    return resolved
+
+
+def resolve_plan_titles(plan_ids: list) -> dict:
+    """Ismeretlen tervek címe: {planId: title}, csak a sikeresek.
+
+    Az azonosítók duplikáció nélkül, 20-as $batch-ekben, legfeljebb PLAN_LOOKUP_WORKERS
+    párhuzamos batch-csel mennek ki. A 403/404-es tervek negatív cache-be kerülnek.
+    """
+    ids = list(dict.fromkeys(pid for pid in plan_ids if pid))
+    if not ids:
+        return {}
+    chunks = [ids[i:i + BATCH_MAX_REQUESTS] for i in range(0, len(ids), BATCH_MAX_REQUESTS)]
+    if len(chunks) == 1:
+        return _resolve_plan_chunk(chunks[0])
+
+    resolved = {}
+    with ThreadPoolExecutor(max_workers=min(PLAN_LOOKUP_WORKERS, len(chunks))) as ex:
+        for part in ex.map(_resolve_plan_chunk, chunks):
+            resolved.update(part)
+    return resolved
+
+
+def list_my_plans():
+    ab = _async_backend()
+    if ab is not None:
+        return ab.run(ab.list_my_plans())
+
+    plans_dict = {}
+    plan_cache = _load_plan_cache()
+
+    ok_plans, msg_plans, plans = _collect_values("/me/planner/plans")
+    if ok_plans:
+        _persist_plan_lookups(_merge_plan_listing(plans_dict, plan_cache, plans), [])
+
+    ok_tasks, msg_tasks, tasks = _collect_values("/me/planner/tasks")
+    if ok_tasks:
+        unknown = _unknown_plan_ids(plans_dict, plan_cache, tasks)
+        if unknown:
+            _apply_plan_titles(plans_dict, resolve_plan_titles(unknown))
+
+    return _plans_result(plans_dict)
+
+
+def _bucket_store() -> dict:
+    global _bucket_cache
+    if _bucket_cache is None:
+        _bucket_cache = _load_bucket_cache()
+    return _bucket_cache
+
+
+def _store_buckets(fetched: dict) -> None:
+    """fetched: {planId: nyers bucket lista}. Változatlan ETag-készletnél csak az időbélyeg frissül."""
+    if not fetched:
+        return
+    now = time.time()
+    with _BUCKET_LOCK:
+        store = _bucket_store()
+        for plan_id, items in fetched.items():
+            etags = {x["id"]: x.get("@odata.etag") for x in items if x.get("id")}
+            entry = store.get(plan_id)
+            if isinstance(entry, dict) and entry.get("etags") == etags:
+                entry["fetched_at"] = now
+                continue
+            store[plan_id] = {
+                "fetched_at": now,
+                "etags": etags,
+                "buckets": [{"id": x.get("id", ""), "name": x.get("name", "")} for x in items if x.get("id")],
+            }
+        _save_bucket_cache(store)
+
+
+def _bucket_entry_fresh(entry) -> bool:
+    try:
+        return isinstance(entry, dict) and time.time() - float(entry.get("fetched_at") or 0) < BUCKET_CACHE_TTL_S
+    except Exception:
+        return False
+
+
+def get_cached_buckets(plan_id: str) -> list | None:
+    """Bucketek a helyi cache-ből, hálózat nélkül (lejárt bejegyzést is visszaad); None, ha nincs."""
+    with _BUCKET_LOCK:
+        entry = _bucket_store().get(plan_id)
+    if not isinstance(entry, dict):
+        return None
+    return list(entry.get("buckets") or [])
+
+
 def list_buckets_for_plan(plan_id: str):
-    ok, msg, res = _planner_api_call("GET", f"/planner/plans/{plan_id}/buckets")
+    ab = _async_backend()
+    if ab is not None:
+        return ab.run(ab.list_buckets(plan_id))
+
+    ok, msg, items = _collect_values(f"/planner/plans/{plan_id}/buckets")
     if not ok:
         return False, msg
-    items = res.json().get("value", []) or []
+    _store_buckets({plan_id: items})
     return True, [{"id": x.get("id", ""), "name": x.get("name", "")} for x in items if x.get("id")]
 
 
-def create_task(title, bucket_id, plan_id, due_date=None):
-    token = get_access_token_silent()
-    if not token:
-        return False, "Nincs bejelentkezve"
-    
-    my_id = get_my_user_id(token)
-    if not my_id:
-        return False, "Nem sikerült azonosítani a felhasználót"
+def prefetch_buckets(plan_ids: list) -> dict:
+    """A hiányzó vagy lejárt bucket listák előtöltése $batch-csel: {planId: buckets}."""
+    with _BUCKET_LOCK:
+        store = _bucket_store()
+        stale = [pid for pid in dict.fromkeys(plan_ids) if pid and not _bucket_entry_fresh(store.get(pid))]
+
+    if stale:
+        fetched = {}
+        results = graph_batch([{"method": "GET", "url": f"/planner/plans/{pid}/buckets"} for pid in stale])
+        for pid, (ok, _msg, _status, body) in zip(stale, results):
+            if not ok or not isinstance(body, dict):
+                continue
+            items = list(body.get("value", []) or [])
+            next_link = body.get("@odata.nextLink")
+            if next_link:
+                ok_more, _m, more = _collect_values(next_link)
+                if not ok_more:
+                    continue
+                items.extend(more)
+            fetched[pid] = items
+        _store_buckets(fetched)
+
+    out = {}
+    for pid in plan_ids:
+        buckets = get_cached_buckets(pid)
+        if buckets is not None:
+            out[pid] = buckets
+    return out
 
+
+def _create_payload(title, bucket_id, plan_id, due_date, my_id: str) -> dict:
     payload = {
         "planId": plan_id,
         "bucketId": bucket_id,
@@ -313,18 +1194,38 @@ def create_task(title, bucket_id, plan_id, due_date=None):
     }
     if due_date:
         payload["dueDateTime"] = f"{due_date}T12:00:00Z"
+    return payload
+
 
+def create_task(title, bucket_id, plan_id, due_date=None):
+    ab = _async_backend()
+    if ab is not None:
+        return ab.run(ab.create_task(title, bucket_id, plan_id, due_date))
+
+    token = get_access_token_silent()
+    if not token:
+        return False, "Nincs bejelentkezve"
+    
+    my_id = get_my_user_id(token)
+    if not my_id:
+        return False, "Nem sikerült azonosítani a felhasználót"
+
+    payload = _create_payload(title, bucket_id, plan_id, due_date, my_id)
     ok, msg, _ = _planner_api_call("POST", "/planner/tasks", payload=payload)
     return ok, msg
 
 
 def update_task_completion(task_id, percent):
+    ab = _async_backend()
+    if ab is not None:
+        return ab.run(ab.update_task_completion(task_id, percent))
+
     payload = {"percentComplete": int(percent)}
     ok, msg, _ = _planner_api_call("PATCH", f"/planner/tasks/{task_id}", payload=payload, needs_etag=True)
     return ok, msg
 
 
-def update_task_details(task_id, new_title=None, new_due_date=None):
+def _details_payload(new_title=None, new_due_date=None) -> dict:
     payload = {}
     if new_title is not None:
         payload["title"] = new_title
@@ -333,14 +1234,39 @@ def update_task_details(task_id, new_title=None, new_due_date=None):
             payload["dueDateTime"] = None
         else:
             payload["dueDateTime"] = f"{new_due_date}T12:00:00Z"
-            
+    return payload
+
+
+def update_task_details(task_id, new_title=None, new_due_date=None):
+    ab = _async_backend()
+    if ab is not None:
+        return ab.run(ab.update_task_details(task_id, new_title, new_due_date))
+
+    payload = _details_payload(new_title, new_due_date)
     if not payload:
         return True, "No changes"
-        
+
     ok, msg, _ = _planner_api_call("PATCH", f"/planner/tasks/{task_id}", payload=payload, needs_etag=True)
     return ok, msg
 
 
+def update_tasks_details_batch(changes):
+    """Több feladat módosítása egy $batch-ben. changes: [(task_id, new_title, new_due_date), ...]"""
+    out: list = [(True, "No changes")] * len(changes)
+    items = []
+    positions = []
+    for pos, (task_id, new_title, new_due_date) in enumerate(changes):
+        payload = _details_payload(new_title, new_due_date)
+        if not payload:
+            continue
+        items.append({"method": "PATCH", "url": f"/planner/tasks/{task_id}", "body": payload, "needs_etag": True})
+        positions.append(pos)
+
+    for pos, (ok, msg, _status, _body) in zip(positions, graph_batch(items)):
+        out[pos] = (ok, msg)
+    return out
+
+
 def complete_task(task_id, *args):
     return update_task_completion(task_id, 100)
 
@@ -350,42 +1276,208 @@ def reopen_task(task_id, *args):
 
 
 def delete_task(task_id):
+    ab = _async_backend()
+    if ab is not None:
+        return ab.run(ab.delete_task(task_id))
+
     ok, msg, _ = _planner_api_call("DELETE", f"/planner/tasks/{task_id}", needs_etag=True)
     return ok, msg
 
 
-def _planner_priority_to_level(p_val: int) -> str:
-    if p_val <= 1:
-        return "urgent"
-    if p_val <= 4:
-        return "important"
-    if p_val <= 7:
-        return "medium"
-    return "low"
+def _format_task(t: dict) -> dict:
+    raw = t.get("priority", None)
+    try:
+        p_val = int(raw) if raw is not None else 5
+    except Exception:
+        p_val = 5
+
+    # A határidő itt, egyszer alakul napsorszámmá; a UI már csak egész számokat hasonlít
+    return {
+        "id": t.get("id"),
+        "title": t.get("title", ""),
+        "status": task_model.Status.DONE if t.get("percentComplete") == 100 else task_model.Status.ACTIVE,
+        "due_ord": task_model.due_ordinal(t.get("dueDateTime")),
+        "priority": task_model.priority_from_planner(p_val),
+        "plan_id": t.get("planId"),
+        "bucket_id": t.get("bucketId"),
+        "order_hint": t.get("orderHint") or "",
+        "assignee_ids": sorted((t.get("assignments") or {}).keys()),
+    }
+
+
+def _merge_delta_item(tasks: dict, item: dict) -> bool:
+    tid = item.get("id")
+    if not tid:
+        return False
+    if "@removed" in item:
+        return tasks.pop(tid, None) is not None
+    if item.get("@odata.type") != _TASK_ODATA_TYPE:
+        return False
+    # A delta csak a megváltozott mezőket küldi, ezért összefésülünk, nem felülírunk
+    cur = tasks.setdefault(tid, {"id": tid})
+    for k in _TASK_FIELDS:
+        if k not in item:
+            continue
+        if k == "assignments" and isinstance(item[k], dict):
+            # Az assignments is csak a változott kulcsokat hozza; a levett hozzárendelés null értékű
+            merged = dict(cur.get(k) or {})
+            for uid, val in item[k].items():
+                if val is None:
+                    merged.pop(uid, None)
+                else:
+                    merged[uid] = val
+            cur[k] = merged
+        else:
+            cur[k] = item[k]
+    return True
 
 
-def fetch_data():
-    ok, msg, res = _planner_api_call("GET", "/me/planner/tasks")
-    if not ok:
-        return {"error": msg}
+def _assigned_to(tasks: dict, user_id: str) -> list[dict]:
+    # A delta a teljes előfizetett feedet hozza (más tagok feladatait is): csak a saját feladatok maradnak,
+    # ahogy a /me/planner/tasks is csak ezeket adja
+    return [t for t in tasks.values() if user_id in (t.get("assignments") or {})]
 
-    tasks = res.json().get("value", [])
-    formatted_tasks = []
 
-    for t in tasks:
-        raw = t.get("priority", None)
+def _run_delta(url: str, tasks: dict):
+    """Generator: végigmegy a delta oldalakon, minden oldal után a (részleges) tasks-ot adja.
+
+    Visszatérési érték (yield from): (ok, msg, deltaLink, changed_ids, status).
+    """
+    changed: set = set()
+    for ok, msg, body, status in iter_pages(url):
+        if not ok:
+            return False, msg, None, changed, status
+        for item in body.get("value", []) or []:
+            if _merge_delta_item(tasks, item):
+                changed.add(item["id"])
+        delta_link = body.get("@odata.deltaLink")
+        if delta_link:
+            return True, "", delta_link, changed, status
+        yield tasks
+    return False, "Hiányzó deltaLink", None, changed, None
+
+
+def _drain(gen):
+    while True:
         try:
-            p_val = int(raw) if raw is not None else 5
-        except Exception:
-            p_val = 5
-        level = _planner_priority_to_level(p_val)
-
-        formatted_tasks.append({
-            "id": t.get("id"),
-            "title": t.get("title", ""),
-            "status": "KESZ" if t.get("percentComplete") == 100 else "FOLYAMATBAN",
-            "date": t.get("dueDateTime", "Nincs határidő")[:10] if t.get("dueDateTime") else "Nincs határidő",
-            "priority": level,
-        })
-
-    return formatted_tasks
+            next(gen)
+        except StopIteration as stop:
+            return stop.value
+
+
+def _full_task_list():
+    ok, msg, items = _collect_values("/me/planner/tasks")
+    if not ok:
+        return False, msg, None
+    tasks = {}
+    for t in items:
+        if t.get("id"):
+            tasks[t["id"]] = {k: t[k] for k in _TASK_FIELDS if k in t}
+    return True, "", tasks
+
+
+def _iter_sync_tasks():
+    """Generator: első (teljes) szinkronnál oldalanként a részleges készletet adja.
+
+    Visszatérési érték (yield from): (ok, msg, tasks).
+    """
+    global _task_sync_state
+    with _SYNC_LOCK:
+        if _task_sync_state is None:
+            _task_sync_state = _load_task_sync()
+        state = _task_sync_state
+        if state.get("deltaUnsupported"):
+            return _full_task_list()
+
+        delta_link = state.get("deltaLink")
+        if delta_link:
+            tasks = {tid: dict(t) for tid, t in (state.get("tasks") or {}).items()}
+            ok, msg, new_link, changed, status = _drain(_run_delta(delta_link, tasks))
+            if ok:
+                _task_sync_state = {"deltaLink": new_link, "tasks": tasks}
+                # Változatlan készletnél a régi deltaLink is érvényes marad, nem írunk lemezre
+                if changed:
+                    _save_task_sync(_task_sync_state, changed)
+                return True, "", tasks
+            if status not in _DELTA_RESYNC_STATUSES:
+                # Hálózati / átmeneti hiba, nincs token: a watermark még érvényes lehet
+                return False, msg, None
+            # Lejárt vagy érvénytelen deltaLink -> teljes újraszinkron
+
+        tasks = {}
+        ok, msg, new_link, _changed, status = yield from _run_delta(_DELTA_ENDPOINT, tasks)
+        if ok:
+            _task_sync_state = {"deltaLink": new_link, "tasks": tasks}
+            _save_task_sync(_task_sync_state, (), replace=True)
+            return True, "", tasks
+        if status not in _DELTA_UNSUPPORTED_STATUSES:
+            return False, msg, None
+
+        # A delta végpont nem elérhető (pl. bérlői korlátozás) -> régi, teljes letöltés
+        _task_sync_state = {"deltaUnsupported": True}
+        return _full_task_list()
+
+
+def iter_fetch_data():
+    """Generator: (final, data) párok. A nem végleges elemek az eddig letöltött oldalak
+    feladatai (csak az első, teljes szinkronnál), az utolsó a teljes lista vagy {"error": ...}.
+    """
+    token = get_access_token_silent()
+    if not token:
+        yield True, {"error": "Nincs bejelentkezve"}
+        return
+    user_id = get_my_user_id(token)
+    if not user_id:
+        yield True, {"error": "A felhasználói azonosító nem érhető el"}
+        return
+
+    gen = _iter_sync_tasks()
+    while True:
+        try:
+            partial = next(gen)
+        except StopIteration as stop:
+            ok, msg, tasks = stop.value
+            break
+        yield False, [_format_task(t) for t in _assigned_to(partial, user_id)]
+
+    if not ok:
+        yield True, {"error": msg}
+        return
+    # Visszavont (pl. kijelentkezés közben futó) lekérés nem írhat a helyi tárba
+    token = current_cancel_token()
+    if token is not None and token.cancelled:
+        yield True, {"error": CANCELLED_MSG}
+        return
+
+    for tid, t in tasks.items():
+        etag = t.get("@odata.etag")
+        if etag:
+            _ETAG_CACHE[f"/planner/tasks/{tid}"] = etag
+
+    with perf_trace.stage("format"):
+        formatted = [_format_task(t) for t in _assigned_to(tasks, user_id)]
+    with perf_trace.stage("store"):
+        task_store.merge_tasks(formatted)
+    perf_trace.add("tasks", len(formatted))
+    yield True, formatted
+
+
+def tasks_fingerprint(tasks) -> str:
+    """A formázott feladatlista tartalmi lenyomata (a mai nappal együtt, mert a csoportosítás attól is függ)."""
+    if not isinstance(tasks, list):
+        return ""
+    h = hashlib.sha1(datetime.now().strftime("%Y-%m-%d").encode("utf-8"))
+    for t in sorted(tasks, key=lambda x: str(x.get("id") or "")):
+        h.update(json.dumps(
+            [t.get("id"), t.get("title"), int(t.get("status") or 0), t.get("due_ord"), int(t.get("priority") or 0),
+             t.get("plan_id"), t.get("bucket_id"), t.get("order_hint"), list(t.get("assignee_ids") or ())],
+            ensure_ascii=False,
+        ).encode("utf-8"))
+    return h.hexdigest()
+
+
+def fetch_data():
+    for final, data in iter_fetch_data():
+        if final:
+            return data
+    return {"error": "Üres válasz"}
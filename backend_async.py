@@ -0,0 +1,288 @@
+# backend_async.py
+# asyncio változat a backend Graph hívásaihoz (httpx, közös kapcsolat-pool, keep-alive, opcionális HTTP/2).
+# A token, az ETag cache, a plan cache és a kérés-ütemező a backend modullal közös;
+# a szinkron backend függvények ezt hívják, ha a httpx telepítve van.
+from __future__ import annotations
+
+import asyncio
+import atexit
+import concurrent.futures
+import threading
+import time
+
+import config
+import backend
+import perf_trace
+
+try:
+    import httpx  # type: ignore
+    AVAILABLE = True
+except Exception:
+    httpx = None  # type: ignore
+    AVAILABLE = False
+
+try:
+    import h2  # type: ignore  # noqa: F401
+    _HTTP2_OK = True
+except Exception:
+    _HTTP2_OK = False
+
+GRAPH_BASE = "https://graph.microsoft.com/v1.0"
+MAX_CONNECTIONS = 8
+MAX_KEEPALIVE = 8
+KEEPALIVE_EXPIRY_S = 60.0
+MAX_CONCURRENT_LOOKUPS = 6
+
+_LOOP: asyncio.AbstractEventLoop | None = None
+_LOOP_LOCK = threading.Lock()
+_client = None
+
+
+def _loop() -> asyncio.AbstractEventLoop:
+    # Egy háttérszálon futó, hosszú életű event loop: a kapcsolatok a hívások között is élnek
+    global _LOOP
+    if _LOOP is None:
+        with _LOOP_LOCK:
+            if _LOOP is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="graph-async", daemon=True).start()
+                _LOOP = loop
+    return _LOOP
+
+
+async def _scoped(coro, token):
+    # A loop szálán a hívó megszakítás-tokenje csak így látszik (a task ebből a kontextusból örököl)
+    with backend.cancel_scope(token):
+        return await coro
+
+
+def run(coro):
+    """Coroutine futtatása a háttér loop-on, szinkron (QRunnable-ből hívható) várakozással.
+
+    Ha a hívó megszakítható (backend.cancel_scope), a visszavonás a futó kéréseket is leállítja.
+    """
+    token = backend.current_cancel_token()
+    fut = asyncio.run_coroutine_threadsafe(_scoped(coro, token), _loop())
+    if token is None:
+        return fut.result()
+    while True:
+        try:
+            return fut.result(timeout=backend.CANCEL_POLL_S)
+        except concurrent.futures.TimeoutError:
+            if token.cancelled:
+                fut.cancel()
+                raise backend.Cancelled()
+
+
+def _get_client():
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            http2=_HTTP2_OK,
+            timeout=15.0,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE,
+                keepalive_expiry=KEEPALIVE_EXPIRY_S,
+            ),
+        )
+    return _client
+
+
+async def _aclose() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _shutdown() -> None:
+    if _LOOP is None or not _LOOP.is_running():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_aclose(), _LOOP).result(timeout=2)
+    except Exception:
+        pass
+    _LOOP.call_soon_threadsafe(_LOOP.stop)
+
+
+atexit.register(_shutdown)
+
+
+async def _send(method: str, url: str, headers: dict, payload=None, priority: int = backend.PRIORITY_USER):
+    sched = backend._SCHEDULER
+    tenant = config.TENANT_ID
+    attempt = 0
+    while True:
+        # A token bucket / Retry-After várakozás blokkoló, ezért szálon várjuk ki
+        await asyncio.to_thread(sched.acquire, tenant, priority)
+        t0 = time.perf_counter_ns()
+        res = await _get_client().request(method, url, headers=headers, json=payload)
+        if perf_trace.ENABLED:
+            backend._trace_response(time.perf_counter_ns() - t0, payload, res)
+        backend.check_cancelled()
+        backend.report_progress()
+        if not sched.should_retry(tenant, res, attempt):
+            return res
+        attempt += 1
+
+
+async def _fetch_etag(url: str, token: str, priority: int):
+    get_res = await _send("GET", url, {"Authorization": f"Bearer {token}", "Cache-Control": "no-cache"}, priority=priority)
+    if get_res.status_code != 200:
+        return None, f"ETag hiba: {get_res.status_code} - {get_res.text}"
+    etag = get_res.json().get("@odata.etag")
+    if not etag:
+        return None, "Hiányzó ETag"
+    return etag, ""
+
+
+async def _planner_api_call(method: str, endpoint: str, payload=None, needs_etag=False, priority: int | None = None):
+    token = await asyncio.to_thread(backend.get_access_token_silent)
+    if not token:
+        return False, "Nincs bejelentkezve", None
+
+    url = endpoint if endpoint.startswith("https://") else f"{GRAPH_BASE}{endpoint}"
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json",
+        "Cache-Control": "no-cache"
+    }
+    if priority is None:
+        priority = backend.PRIORITY_BACKGROUND if method == "GET" else backend.PRIORITY_USER
+
+    try:
+        if needs_etag:
+            etag = backend._ETAG_CACHE.get(endpoint)
+            if not etag:
+                etag, err = await _fetch_etag(url, token, priority)
+                if not etag:
+                    return False, err, None
+            headers["If-Match"] = etag
+            headers["Prefer"] = "return=representation"
+
+        if method not in ("GET", "POST", "PATCH", "DELETE"):
+            return False, "Ismeretlen metódus", None
+        res = await _send(method, url, headers, payload, priority)
+
+        if needs_etag and res.status_code == 412:
+            backend._ETAG_CACHE.pop(endpoint, None)
+            etag, err = await _fetch_etag(url, token, priority)
+            if not etag:
+                return False, err, None
+            headers["If-Match"] = etag
+            res = await _send(method, url, headers, payload, priority)
+
+        if res.status_code in (200, 201, 204):
+            backend._remember_etag(method, endpoint, res)
+            return True, "", res
+        return False, f"API hiba: {res.status_code} - {res.text}", res
+    except backend.Cancelled:
+        return False, backend.CANCELLED_MSG, None
+    except Exception as e:
+        return False, f"Hálózati hiba: {e}", None
+
+
+async def _collect_values(endpoint: str):
+    out = []
+    url = endpoint
+    while url:
+        ok, msg, res = await _planner_api_call("GET", url)
+        if not ok:
+            return False, msg, out
+        body = res.json() or {}
+        out.extend(body.get("value", []) or [])
+        url = body.get("@odata.nextLink")
+    return True, "", out
+
+
+async def list_buckets(plan_id: str):
+    ok, msg, items = await _collect_values(f"/planner/plans/{plan_id}/buckets")
+    if not ok:
+        return False, msg
+    await asyncio.to_thread(backend._store_buckets, {plan_id: items})
+    return True, [{"id": x.get("id", ""), "name": x.get("name", "")} for x in items if x.get("id")]
+
+
+async def resolve_plan_titles(plan_ids: list) -> dict:
+    sem = asyncio.Semaphore(MAX_CONCURRENT_LOOKUPS)
+
+    async def one(pid: str):
+        async with sem:
+            ok, _msg, res = await _planner_api_call("GET", f"/planner/plans/{pid}")
+        if ok and res is not None:
+            return pid, (res.json() or {}).get("title", "(Névtelen Terv)"), None
+        return pid, None, getattr(res, "status_code", None)
+
+    resolved = {}
+    pending_ok: dict = {}
+    pending_denied: list = []
+    ids = list(dict.fromkeys(pid for pid in plan_ids if pid))
+    for done in asyncio.as_completed([one(pid) for pid in ids]):
+        pid, title, status = await done
+        if title is not None:
+            resolved[pid] = title
+            pending_ok[pid] = title
+        elif status in (403, 404):
+            pending_denied.append(pid)
+
+        # Hullámonként mentünk, hogy a részeredmények megszakadás esetén is megmaradjanak
+        if len(pending_ok) + len(pending_denied) >= MAX_CONCURRENT_LOOKUPS:
+            await asyncio.to_thread(backend._persist_plan_lookups, pending_ok, pending_denied)
+            pending_ok, pending_denied = {}, []
+
+    await asyncio.to_thread(backend._persist_plan_lookups, pending_ok, pending_denied)
+    return resolved
+
+
+async def list_my_plans():
+    plans_dict = {}
+    plan_cache = await asyncio.to_thread(backend._load_plan_cache)
+
+    (ok_plans, _msg_plans, plans), (ok_tasks, _msg_tasks, tasks) = await asyncio.gather(
+        _collect_values("/me/planner/plans"),
+        _collect_values("/me/planner/tasks"),
+    )
+    if ok_plans:
+        changed = backend._merge_plan_listing(plans_dict, plan_cache, plans)
+        await asyncio.to_thread(backend._persist_plan_lookups, changed, [])
+
+    if ok_tasks:
+        unknown = backend._unknown_plan_ids(plans_dict, plan_cache, tasks)
+        if unknown:
+            backend._apply_plan_titles(plans_dict, await resolve_plan_titles(unknown))
+
+    return backend._plans_result(plans_dict)
+
+
+async def create_task(title, bucket_id, plan_id, due_date=None):
+    token = await asyncio.to_thread(backend.get_access_token_silent)
+    if not token:
+        return False, "Nincs bejelentkezve"
+
+    my_id = await asyncio.to_thread(backend.get_my_user_id, token)
+    if not my_id:
+        return False, "Nem sikerült azonosítani a felhasználót"
+
+    payload = backend._create_payload(title, bucket_id, plan_id, due_date, my_id)
+    ok, msg, _ = await _planner_api_call("POST", "/planner/tasks", payload=payload)
+    return ok, msg
+
+
+async def update_task_completion(task_id, percent):
+    payload = {"percentComplete": int(percent)}
+    ok, msg, _ = await _planner_api_call("PATCH", f"/planner/tasks/{task_id}", payload=payload, needs_etag=True)
+    return ok, msg
+
+
+async def update_task_details(task_id, new_title=None, new_due_date=None):
+    payload = backend._details_payload(new_title, new_due_date)
+    if not payload:
+        return True, "No changes"
+    ok, msg, _ = await _planner_api_call("PATCH", f"/planner/tasks/{task_id}", payload=payload, needs_etag=True)
+    return ok, msg
+
+
+async def delete_task(task_id):
+    ok, msg, _ = await _planner_api_call("DELETE", f"/planner/tasks/{task_id}", needs_etag=True)
+    return ok, msg
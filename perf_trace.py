@@ -0,0 +1,161 @@
+# perf_trace.py
+# Opcionális mérés a fetch -> parse -> render láncra (perf_counter_ns szakaszok, kérés/bájt/kártya számlálók).
+# Bekapcsolás: ui_config.PERF_TRACE = True vagy PLANNER_PERF=1 környezeti változó.
+# Minden minta egy sor a forgó JSONL fájlban; az utolsó frissítés bontását a fejléc mutatja.
+# A mintát a UI szál (begin/finish) és a lekérés szálai (scope) töltik; más háttérhívás
+# (tervek, név, bucket előtöltés) nem kerül bele.
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    from ui_config import PERF_TRACE
+except Exception:
+    PERF_TRACE = False
+
+ENABLED = bool(PERF_TRACE) or os.environ.get("PLANNER_PERF", "") not in ("", "0")
+
+TRACE_FILE = "perf_trace.jsonl"
+TRACE_MAX_BYTES = 1_000_000
+TRACE_BACKUPS = 3
+
+# A fejléc összegzés sorrendje: szakasz -> rövid címke
+STAGES = (
+    ("network", "net"),
+    ("parse", "json"),
+    ("format", "fmt"),
+    ("store", "db"),
+    ("viewmodel", "vm"),
+    ("render", "ui"),
+)
+
+_lock = threading.Lock()
+_current: dict | None = None
+# A lekérést végző szál(ak) mintája; a UI szál a _current-et használja
+_scoped: contextvars.ContextVar = contextvars.ContextVar("perf_trace_sample", default=None)
+
+
+def begin(kind: str) -> dict | None:
+    """Új minta indítása (a korábbi, le nem zárt minta eldobódik); a scope()-nak átadható."""
+    global _current
+    if not ENABLED:
+        return None
+    with _lock:
+        _current = {"kind": kind, "t0": time.perf_counter_ns(), "stages": {}, "counts": {}}
+        return _current
+
+
+def current() -> dict | None:
+    return _current
+
+
+@contextmanager
+def scope(sample: dict | None):
+    """A blokkban (és a belőle másolt kontextusban) mért értékek a megadott mintába kerülnek."""
+    reset = _scoped.set(sample)
+    try:
+        yield sample
+    finally:
+        _scoped.reset(reset)
+
+
+def _target() -> dict | None:
+    sample = _scoped.get()
+    if sample is None and threading.current_thread() is threading.main_thread():
+        sample = _current
+    return sample
+
+
+def add(key: str, n: int = 1) -> None:
+    if not ENABLED:
+        return
+    sample = _target()
+    if sample is None:
+        return
+    with _lock:
+        sample["counts"][key] = sample["counts"].get(key, 0) + int(n)
+
+
+def add_ns(name: str, ns: int) -> None:
+    if not ENABLED:
+        return
+    sample = _target()
+    if sample is None:
+        return
+    with _lock:
+        sample["stages"][name] = sample["stages"].get(name, 0) + int(ns)
+
+
+@contextmanager
+def stage(name: str):
+    if not ENABLED:
+        yield
+        return
+    t0 = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        add_ns(name, time.perf_counter_ns() - t0)
+
+
+def finish(**extra) -> dict | None:
+    """A futó minta lezárása: JSONL-be írja és visszaadja (None, ha nincs mérés)."""
+    global _current
+    if not ENABLED:
+        return None
+    with _lock:
+        sample, _current = _current, None
+    if sample is None:
+        return None
+
+    record = {
+        "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "kind": sample["kind"],
+        "total_ms": round((time.perf_counter_ns() - sample["t0"]) / 1e6, 2),
+        "stages_ms": {k: round(v / 1e6, 2) for k, v in sample["stages"].items()},
+        "counts": sample["counts"],
+    }
+    record.update(extra)
+    _append(record)
+    return record
+
+
+def _rotate() -> None:
+    for i in range(TRACE_BACKUPS - 1, 0, -1):
+        src = f"{TRACE_FILE}.{i}"
+        if os.path.exists(src):
+            os.replace(src, f"{TRACE_FILE}.{i + 1}")
+    os.replace(TRACE_FILE, f"{TRACE_FILE}.1")
+
+
+def _append(record: dict) -> None:
+    try:
+        with _lock:
+            if os.path.exists(TRACE_FILE) and os.path.getsize(TRACE_FILE) >= TRACE_MAX_BYTES:
+                _rotate()
+            with open(TRACE_FILE, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except Exception as e:
+        print(f"Perf trace írási hiba: {e}")
+
+
+def summary(record: dict | None) -> str:
+    """Egysoros bontás a fejléc overlay-hez."""
+    if not record:
+        return ""
+    st = record.get("stages_ms", {})
+    c = record.get("counts", {})
+    parts = [f"{record.get('total_ms', 0):.0f}ms"]
+    for key, label in STAGES:
+        if key in st:
+            parts.append(f"{label} {st[key]:.0f}")
+    if c.get("requests"):
+        parts.append(f"{c['requests']} req {c.get('bytes_in', 0) / 1024:.0f}KB")
+    if "cards_built" in c or "cards_total" in c:
+        parts.append(f"kártya {c.get('cards_built', 0)}/{c.get('cards_total', 0)}")
+    return " · ".join(parts)
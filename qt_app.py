@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import copy
 import json
 import os
 import re
+import threading
+import time
 from datetime import datetime, timedelta
 
 try:
@@ -36,19 +39,28 @@ from PyQt6.QtGui import QMouseEvent
 from PyQt6.QtWidgets import QStyle
 
 import backend
+import task_store
+import perf_trace
 
 from ui_config import (
     REFRESH_RATE_SECONDS, WINDOW_WIDTH, WINDOW_MIN_WIDTH, WINDOW_MAX_HEIGHT, WINDOW_MIN_HEIGHT,
-    ANIM_DURATION_MS, ALWAYS_ON_TOP,
-    STARTSOUND, COMPLETESOUND, REOPENSOUND, today_ymd
+    ANIM_DURATION_MS, ALWAYS_ON_TOP, VIRTUAL_LIST_THRESHOLD,
+    STARTSOUND, COMPLETESOUND, REOPENSOUND, PLANNERCONFIG, today_ymd
 )
 from qt_styles import APP_QSS
 from qt_sound import play_sound
-from qt_workers import start_fetch, start_action
-from qt_widgets import TaskViewModel, validate_ymd, TaskCard, SeparatorLine, MinimalButton
+from qt_workers import FetchCoordinator, FETCH_SUPERSEDE_MS, start_action, start_background, start_call, cancel_calls
+from qt_widgets import (
+    TaskViewModel, validate_ymd, TaskCard, SeparatorLine, MinimalButton, PlanSectionHeader, set_style_prop,
+)
+from task_model import Status, Tone, TaskIndex, in_order_ids, view_models, with_status
+from qt_task_view import TaskListView
+from task_search import TaskSearchIndex
 
-BUSY_GUARD_MS = 60000
+RENDER_FRAME_BUDGET_MS = 8     # egy eseményciklus-szeletben ennyi ideig építünk új kártyákat
+RENDER_CARD_HEIGHT_EST = 90    # az első képernyőnyi kártya becsléséhez
 DEFAULTS_FILE = "planner_defaults.json"
+DEFAULTS_SAVE_DELAY_MS = 500
 
 GLOBAL_HOTKEY = "alt+w"
 
@@ -59,6 +71,9 @@ _WORK_PDF_KEY      = "__work_pdf_path"
 _WORK_TPL_KEY      = "__work_pdf_templates"
 _WORK_RUNNING_KEY  = "__work_running"
 _WORK_START_KEY    = "__work_start_iso"
+_GROUP_VIEW_KEY    = "__group_by_plan"
+_PLAN_OPEN_KEY     = "__plan_sections_open"
+_DONE_GROUP_SUFFIX = "#done"   # a szakasz kész csoportjának kulcsa: planId + utótag
 
 _DIALOG_QSS = """
 QDialog { background-color: #1E1E2E; color: #E0E0E0; border: 1px solid #444466; border-radius: 8px; }
@@ -84,6 +99,17 @@ QMessageBox QPushButton:hover { background-color: #4455AA; border: 1px solid #66
 QMessageBox QPushButton:pressed { background-color: #334499; }
 """
 
+def _pinned_plans() -> dict[str, str]:
+    # PLANNERCONFIG: címke -> (bucketId, planId); tervenként az első címke, a konfig sorrendjében
+    pinned: dict[str, str] = {}
+    for label, (_bucket_id, plan_id) in PLANNERCONFIG.items():
+        pinned.setdefault(plan_id, label)
+    return pinned
+
+
+_PINNED_PLANS = _pinned_plans()
+
+
 def _natural_sort_key(s: str) -> list:
     return [int(text) if text.isdigit() else text.lower() for text in re.split(r'(\d+)', s)]
 
@@ -93,15 +119,37 @@ def _load_defaults() -> dict:
     try:
         with open(DEFAULTS_FILE, "r", encoding="utf-8") as f:
             return json.load(f) or {}
-    except Exception:
+    except Exception as e:
+        # Olvashatatlan fájl: félretesszük, hogy a következő mentés ne írja felül nyomtalanul
+        print(f"Beállítás fájl hiba: {e}")
+        try:
+            os.replace(DEFAULTS_FILE, DEFAULTS_FILE + ".corrupt")
+        except Exception:
+            pass
         return {}
 
-def _save_defaults(data: dict) -> None:
-    try:
-        with open(DEFAULTS_FILE, "w", encoding="utf-8") as f:
-            json.dump(data or {}, f, ensure_ascii=False, indent=2)
-    except Exception:
-        pass
+_DEFAULTS_SAVE_LOCK = threading.Lock()
+_defaults_saved_seq = 0
+
+def _save_defaults(data: dict, seq: int) -> bool:
+    # Temp fájl + os.replace: összeomláskor a régi vagy az új tartalom marad meg, csonka soha.
+    # A háttér- és a kilépéskori mentés bármilyen sorrendben végezhet: régebbi állapot nem ír felül újabbat.
+    global _defaults_saved_seq
+    with _DEFAULTS_SAVE_LOCK:
+        if seq <= _defaults_saved_seq:
+            return True
+        tmp = DEFAULTS_FILE + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data or {}, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, DEFAULTS_FILE)
+        except Exception as e:
+            print(f"Beállítás mentési hiba: {e}")
+            return False
+        _defaults_saved_seq = seq
+        return True
 
 class _FieldPickerDialog(QDialog):
     def __init__(self, title: str, label: str, field_names: list[str], parent=None) -> None:
@@ -351,7 +399,6 @@ class TaskHudWindow(QWidget):
         self._dragging = False
         self._expanded = False
         self._expanded_width = True
-        self._is_refreshing = False
 
         self._global_edit_mode = False
         self._pending_saves = 0
@@ -369,6 +416,26 @@ class TaskHudWindow(QWidget):
         self._status_clear_timer.timeout.connect(self._restore_counts_text)
 
         self._last_tasks: list[TaskViewModel] = []
+        self._cards_by_id: dict[str, TaskCard] = {}
+        # Helyi, még meg nem erősített (vagy frissítéssel még nem látott) módosítások:
+        # task_id -> {"kind": "done"/"reopen"/"delete", "original": TaskViewModel, "confirmed_seq": int | None}
+        self._pending_mutations: dict[str, dict] = {}
+        # Időszeletelt renderelés: a generáció váltása megszakítja a folyamatban lévő építést
+        self._render_gen = 0
+        self._render_entries: list = []
+        self._render_pos = 0
+        self._perf_open = False
+        self._search_index = TaskSearchIndex()
+        self._filter_ids: set[str] | None = None
+        # Csoportosított nézet: tervenkénti szakaszok; kártya csak a kinyitott szakaszokhoz épül
+        self._task_index = TaskIndex()
+        self._section_headers: dict[str, PlanSectionHeader] = {}
+        self._section_tasks: dict[str, tuple[list, list]] = {}   # kulcs -> (aktív, kész)
+        self._plan_titles: dict[str, str] = {}
+        self._refresh_intro = False
+        self._done_separator: SeparatorLine | None = None
+        self._pager: QWidget | None = None
+        self._last_fingerprint: str | None = None
         self._completed_page = 1
 
         self._correcting_size = False
@@ -376,26 +443,40 @@ class TaskHudWindow(QWidget):
         self._anim_y_edge: int | None = None
 
         self._defaults = _load_defaults()
+        self._defaults_seq = 0
+        self._defaults_timer = QTimer(self)
+        self._defaults_timer.setSingleShot(True)
+        self._defaults_timer.setInterval(DEFAULTS_SAVE_DELAY_MS)
+        self._defaults_timer.timeout.connect(self._save_defaults_in_background)
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._flush_defaults)
 
         self._work_running  = bool(self._defaults.get(_WORK_RUNNING_KEY, False))
         self._work_start_dt: datetime | None = None
         self._work_pdf_path: str | None = self._defaults.get(_WORK_PDF_KEY) or None
         self._work_tpl: dict  = self._defaults.get(_WORK_TPL_KEY) or {}
+        self._group_by_plan = bool(self._defaults.get(_GROUP_VIEW_KEY, False))
+        self._plan_open: dict = dict(self._defaults.get(_PLAN_OPEN_KEY) or {})
 
         self._work_timer = QTimer(self)
         self._work_timer.setInterval(60_000)
         self._work_timer.timeout.connect(self._tick_work_timer)
 
         self._plan_items: list[dict] = []
+        self._display_name: str | None = None
+        self._plans_loading = False
         self._plan_by_label: dict[str, dict] = {}
         self._buckets_by_plan: dict[str, list[dict]] = {}
 
         self._selected_plan_id: str | None = None
         self._selected_bucket_id: str | None = None
 
-        self._busy_guard = QTimer(self)
-        self._busy_guard.setSingleShot(True)
-        self._busy_guard.timeout.connect(self._on_busy_timeout)
+        # Lekérések: generációszám, összevonás és visszavonás (a régi, elavult válasz nem írhat felül)
+        self._fetcher = FetchCoordinator(self)
+        self._fetcher.started.connect(self._on_fetch_started)
+        self._fetcher.page.connect(self._on_fetched_page)
+        self._fetcher.fetched.connect(self._on_fetched)
 
         self.card = QFrame(self)
         self.card.setObjectName("MainCard")
@@ -522,7 +603,37 @@ class TaskHudWindow(QWidget):
 
         self.scroll.verticalScrollBar().installEventFilter(self)
 
-        self.content_layout.addWidget(self.scroll)
+        self.task_view = TaskListView()
+        self.task_view.done_clicked.connect(self._on_done)
+        self.task_view.reopen_clicked.connect(self._on_reopen)
+        self.task_view.delete_clicked.connect(self._on_delete)
+        self.task_view.verticalScrollBar().installEventFilter(self)
+
+        self.list_stack = QStackedWidget()
+        self.list_stack.addWidget(self.scroll)
+        self.list_stack.addWidget(self.task_view)
+
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Keresés...")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self._on_filter_changed)
+
+        self.btn_group = QPushButton("Tervek")
+        self.btn_group.setCheckable(True)
+        self.btn_group.setChecked(self._group_by_plan)
+        self.btn_group.setToolTip("Csoportosítás tervenként")
+        self.btn_group.toggled.connect(self._on_group_toggled)
+
+        self.search_row = QWidget()
+        sr = QHBoxLayout(self.search_row)
+        sr.setContentsMargins(0, 0, 0, 0)
+        sr.setSpacing(8)
+        sr.addWidget(self.search_edit, 1)
+        sr.addWidget(self.btn_group, 0)
+        self.search_row.setVisible(False)
+
+        self.content_layout.addWidget(self.search_row)
+        self.content_layout.addWidget(self.list_stack)
         self.card_layout.addWidget(self.content)
 
         self.setStyleSheet(APP_QSS)
@@ -542,7 +653,7 @@ class TaskHudWindow(QWidget):
             app_inst.screenAdded.connect(self._on_screen_added)
 
         self.header.h_toggle_clicked.connect(self.toggle_width)
-        self.header.refresh_clicked.connect(lambda: self.start_refresh(skip_intro=False))
+        self.header.refresh_clicked.connect(lambda: self.start_refresh(skip_intro=False, supersede=True))
         self.header.toggle_clicked.connect(self.toggle_expand)
         self.header.close_clicked.connect(self._close_requested)
         self.header.text_changed.connect(self._adjust_mini_size_if_needed)
@@ -556,12 +667,11 @@ class TaskHudWindow(QWidget):
 
         QTimer.singleShot(0, self._show_startup_banner)
 
-        if backend.get_access_token_silent():
-            self._update_ui_for_logged_in()
-            self.start_refresh(skip_intro=False)
-            QTimer.singleShot(300, self._load_plans_from_graph)
-        else:
-            self._update_ui_for_logged_out()
+        # Offline-first: a helyi tárból azonnal rajzolunk, a hálózat a háttérben egyeztet
+        self._render_from_store()
+
+        # A csendes token-frissítés hálózatot is érinthet (MSAL): háttérszálon fut
+        start_call("get_access_token_silent", (), self._on_startup_token)
 
         self.hotkey_pressed.connect(self.bring_to_front)
         if _KEYBOARD_OK and keyboard is not None:
@@ -574,6 +684,23 @@ class TaskHudWindow(QWidget):
 
         self._restore_work_state_on_startup()
 
+    def _on_startup_token(self, tok) -> None:
+        if isinstance(tok, str) and tok:
+            self._update_ui_for_logged_in()
+            self.start_refresh(skip_intro=False)
+            QTimer.singleShot(300, self._load_plans_from_graph)
+        else:
+            self._update_ui_for_logged_out()
+
+    def _render_from_store(self) -> None:
+        cached = task_store.load_tasks()
+        if not cached:
+            return
+        tasks_vm = self._tasks_from_data(cached)
+        self._last_fingerprint = backend.tasks_fingerprint(cached)
+        self._update_header_counts(tasks_vm)
+        self._render_tasks(tasks_vm)
+
     def _on_screen_added(self, screen) -> None:
         screen.geometryChanged.connect(self._on_screen_geometry_changed)
 
@@ -824,9 +951,9 @@ class TaskHudWindow(QWidget):
                 self._dragging = False
                 return True if was_dragging else False
 
-        if obj is self.scroll.verticalScrollBar():
+        if obj is self.scroll.verticalScrollBar() or obj is self.task_view.verticalScrollBar():
             if event.type() == event.Type.MouseButtonPress and event.button() == Qt.MouseButton.LeftButton:
-                sb = self.scroll.verticalScrollBar()
+                sb = obj
                 opt = QStyleOptionSlider()
                 sb.initStyleOption(opt)
 
@@ -856,7 +983,25 @@ class TaskHudWindow(QWidget):
         else:
             self.close()
 
+    def _schedule_defaults_save(self) -> None:
+        # Gyors egymás utáni változtatások egyetlen lemezírásba olvadnak
+        self._defaults_seq += 1
+        self._defaults_timer.start()
+
+    def _save_defaults_in_background(self) -> None:
+        # Pillanatképet ír egy háttérszál, így az fsync nem akasztja meg a GUI szálat
+        if self._defaults_seq <= _defaults_saved_seq:
+            return
+        start_background(_save_defaults, copy.deepcopy(self._defaults), self._defaults_seq)
+
+    def _flush_defaults(self) -> None:
+        # Bezáráskor / kilépéskor szinkron mentés, hogy az utolsó változás se vesszen el
+        self._defaults_timer.stop()
+        if self._defaults_seq > _defaults_saved_seq:
+            _save_defaults(self._defaults, self._defaults_seq)
+
     def closeEvent(self, event) -> None:
+        self._flush_defaults()
         try:
             if _KEYBOARD_OK and keyboard is not None:
                 keyboard.unhook_all()
@@ -864,8 +1009,9 @@ class TaskHudWindow(QWidget):
             pass
 
         try:
-            self._busy_guard.stop()
             self.timer.stop()
+            self._fetcher.cancel()
+            cancel_calls()
         except Exception:
             pass
         event.accept()
@@ -942,11 +1088,6 @@ class TaskHudWindow(QWidget):
     def toggle_expand(self) -> None:
         self._apply_expanded_state(not self._expanded, immediate=False)
 
-    def _on_busy_timeout(self) -> None:
-        self._is_refreshing = False
-        self.header.set_busy(False)
-        self.set_status_guarded("Timeout", kind="warn")
-
     def _toggle_add_panel(self) -> None:
         now = not self.add_panel.isVisible()
         self.add_panel.setVisible(now)
@@ -976,6 +1117,7 @@ class TaskHudWindow(QWidget):
         self.btn_reset_pdf.setVisible(True)
         self.btn_work.setDisabled(not _PYPDF_OK)
         self.add_toggle.setVisible(True)
+        self.search_row.setVisible(True)
         self.lr.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
     def _update_ui_for_logged_out(self) -> None:
@@ -986,7 +1128,16 @@ class TaskHudWindow(QWidget):
         self.lbl_hint.setText("Kérlek jelentkezz be, v1.05")
         
         # Nullázzuk a memóriát
+        self._plans_loading = False
+        self._refresh_intro = False
+        self._display_name = None
         self._last_tasks = []
+        self._last_fingerprint = None
+        self._pending_mutations.clear()
+        self._search_index.clear()
+        self._task_index.clear()
+        self.search_edit.clear()
+        self.search_row.setVisible(False)
         self._last_counts_active = None
         self._last_counts_expired = None
         self._clear_task_widgets()
@@ -1022,7 +1173,7 @@ class TaskHudWindow(QWidget):
         if not iso:
             self._work_running = False
             self._defaults[_WORK_RUNNING_KEY] = False
-            _save_defaults(self._defaults)
+            self._schedule_defaults_save()
             self.header.set_work_minutes(None)
             self.btn_work.setText("Munka kezdete")
             return
@@ -1032,7 +1183,7 @@ class TaskHudWindow(QWidget):
         except Exception:
             self._work_running = False
             self._defaults[_WORK_RUNNING_KEY] = False
-            _save_defaults(self._defaults)
+            self._schedule_defaults_save()
             self.header.set_work_minutes(None)
             self.btn_work.setText("Munka kezdete")
             return
@@ -1062,7 +1213,7 @@ class TaskHudWindow(QWidget):
             self._work_tpl = {}
             if _WORK_TPL_KEY in self._defaults:
                 del self._defaults[_WORK_TPL_KEY]
-            _save_defaults(self._defaults)
+            self._schedule_defaults_save()
 
             return self._configure_pdf_fields_interactive()
 
@@ -1075,7 +1226,7 @@ class TaskHudWindow(QWidget):
                     return False
                 self._work_pdf_path = path
                 self._defaults[_WORK_PDF_KEY] = path
-                _save_defaults(self._defaults)
+                self._schedule_defaults_save()
 
             if not isinstance(self._work_tpl, dict):
                 self._work_tpl = {}
@@ -1136,7 +1287,7 @@ class TaskHudWindow(QWidget):
             if msg.clickedButton() == btn_yes:
                 self._work_tpl = detected
                 self._defaults[_WORK_TPL_KEY] = self._work_tpl
-                _save_defaults(self._defaults)
+                self._schedule_defaults_save()
                 return True
 
         sorted_names = sorted(names, key=_natural_sort_key)
@@ -1175,7 +1326,7 @@ class TaskHudWindow(QWidget):
             self._work_tpl["total_hours"] = str(tot)
             
         self._defaults[_WORK_TPL_KEY] = self._work_tpl
-        _save_defaults(self._defaults)
+        self._schedule_defaults_save()
         return True
 
     def _on_work_button_clicked(self) -> None:
@@ -1203,7 +1354,7 @@ class TaskHudWindow(QWidget):
             self._work_running = True
             self._defaults[_WORK_RUNNING_KEY] = True
             self._defaults[_WORK_START_KEY] = now.isoformat(timespec="seconds")
-            _save_defaults(self._defaults)
+            self._schedule_defaults_save()
 
             day = now.day
             arr_field = _resolve_tpl(str(self._work_tpl.get("arrival") or ""), day)
@@ -1226,7 +1377,7 @@ class TaskHudWindow(QWidget):
         if not self._work_start_dt:
             self._work_running = False
             self._defaults[_WORK_RUNNING_KEY] = False
-            _save_defaults(self._defaults)
+            self._schedule_defaults_save()
             self.btn_work.setText("Munka kezdete")
             self.header.set_work_minutes(None)
             return
@@ -1245,7 +1396,7 @@ class TaskHudWindow(QWidget):
         
         hours = _safe_hours((end_rounded - start_rounded).total_seconds())
         hours_str = str(hours)
-        sign_name = backend.get_my_display_name() or ""
+        sign_name = self._display_name or ""
 
         values = {
             leave_field: leave_time,
@@ -1311,24 +1462,25 @@ class TaskHudWindow(QWidget):
         self.header.set_work_minutes(None)
         self._defaults[_WORK_RUNNING_KEY] = False
         self._defaults[_WORK_START_KEY]   = ""
-        _save_defaults(self._defaults)
+        self._schedule_defaults_save()
         self.btn_work.setText("Munka kezdete")
 
     def start_login_mainthread(self) -> None:
         self.btn_login.setDisabled(True)
         self.header.set_busy(True)
         self.set_status_guarded("Bejelentkezés...", kind="info")
-        QApplication.processEvents()
 
-        tok = None
-        try:
-            tok = backend.get_access_token_interactive()
-        except Exception as e:
-            self.set_status_guarded(f"Token hiba: {e}", kind="error")
+        # A böngészős bejelentkezés háttérszálon vár, az ablak közben használható marad
+        start_call("get_access_token_interactive", (), self._on_login_finished)
 
+    def _on_login_finished(self, tok) -> None:
         self.header.set_busy(False)
         self.btn_login.setDisabled(False)
 
+        if isinstance(tok, dict) and "error" in tok:
+            self.set_status_guarded(f"Token hiba: {tok.get('error')}", kind="error")
+            return
+
         if not tok:
             self.set_status_guarded("Nem sikerült bejelentkezni.", kind="warn")
             return
@@ -1340,14 +1492,39 @@ class TaskHudWindow(QWidget):
 
     def start_logout_mainthread(self) -> None:
         self.set_status_guarded("Kijelentkezés...", kind="info")
+        # A futó lekérések előbb leállnak: így nem tartják a szinkron zárat, és nem írnak a tárba
+        self._fetcher.cancel()
+        cancel_calls()
+        self.header.set_busy(False)
         if backend.logout():
             self._update_ui_for_logged_out()
             self.set_status_guarded("Sikeres kijelentkezés.", kind="ok", auto_clear_ms=2000)
         else:
+            # Bejelentkezve maradtunk: a visszavont tervlista / név / frissítés újraindul
+            self._plans_loading = False
             self.set_status_guarded("Hiba a kijelentkezés során.", kind="error")
+            self._load_plans_from_graph()
+            self.start_refresh(skip_intro=True)
 
     def _load_plans_from_graph(self) -> None:
-        ok, plans_or_msg = backend.list_my_plans()
+        if self._plans_loading:
+            return
+        self._plans_loading = True
+        start_call("list_my_plans", (), self._on_plans_loaded, cancellable=True)
+        start_call("get_my_display_name", (), self._on_display_name_loaded, cancellable=True)
+
+    def _on_display_name_loaded(self, display_name) -> None:
+        if isinstance(display_name, str) and display_name:
+            self._display_name = display_name
+            self.lbl_hint.setText(f"Üdv {display_name}, v1.05")
+        else:
+            self.lbl_hint.setText("Üdv, v1.05")
+
+    def _on_plans_loaded(self, res) -> None:
+        self._plans_loading = False
+        if not isinstance(res, tuple) or len(res) != 2:
+            return
+        ok, plans_or_msg = res
         if not ok:
             return
 
@@ -1364,16 +1541,19 @@ class TaskHudWindow(QWidget):
             if label in self._plan_by_label:
                 label = f"{title} ({pid[:6]}…)"
             self._plan_by_label[label] = {"id": pid, "title": title}
+            self._plan_titles[pid] = title
             labels.append(label)
 
         labels = sorted(labels, key=lambda s: s.lower())
         self.add_panel.set_plan_options(labels)
+        if self._group_by_plan and self._last_tasks:
+            # A szakaszok sorrendje a címektől függ: újrarendezés a most megérkezett címekkel
+            self._render_tasks(self._last_tasks)
 
-        display_name = backend.get_my_display_name()
-        if display_name:
-            self.lbl_hint.setText(f"Üdv {display_name}, v1.05")
-        else:
-            self.lbl_hint.setText("Üdv, v1.05")
+        # Minden terv bucket listáját előtöltjük, hogy a tervválasztás azonnali legyen
+        plan_ids = [p["id"] for p in self._plan_by_label.values()]
+        if plan_ids:
+            start_call("prefetch_buckets", (plan_ids,), self._on_buckets_prefetched, cancellable=True)
 
         if self.anim.state() != QPropertyAnimation.State.Running:
             self._lock_width_constraints()
@@ -1390,11 +1570,17 @@ class TaskHudWindow(QWidget):
         self._selected_plan_id = plan_id
 
         if plan_id not in self._buckets_by_plan:
-            okb, buckets_or_msg = backend.list_buckets_for_plan(plan_id)
-            if not okb:
-                self._buckets_by_plan[plan_id] = []
-            else:
-                self._buckets_by_plan[plan_id] = buckets_or_msg or []
+            cached = backend.get_cached_buckets(plan_id)
+            if cached is None:
+                # Még nincs a cache-ben: háttérben töltjük, a GUI szál nem vár a hálózatra
+                self._selected_bucket_id = None
+                self.add_panel.set_bucket_options([], enabled=False)
+                start_call(
+                    "list_buckets_for_plan", (plan_id,),
+                    lambda res, pid=plan_id, label=plan_label: self._on_buckets_loaded(res, pid, label)
+                )
+                return
+            self._buckets_by_plan[plan_id] = cached
 
         buckets = self._buckets_by_plan.get(plan_id, [])
         if not buckets:
@@ -1427,6 +1613,18 @@ class TaskHudWindow(QWidget):
 
         self._selected_bucket_id = None
 
+    def _on_buckets_loaded(self, res, plan_id: str, plan_label: str) -> None:
+        ok = isinstance(res, tuple) and len(res) == 2 and res[0]
+        self._buckets_by_plan[plan_id] = (res[1] or []) if ok else []
+        if self._selected_plan_id == plan_id:
+            self._on_plan_changed(plan_label)
+
+    def _on_buckets_prefetched(self, res) -> None:
+        if not isinstance(res, dict) or "error" in res:
+            return
+        for plan_id, buckets in res.items():
+            self._buckets_by_plan[plan_id] = buckets or []
+
     def _on_bucket_changed(self, bucket_name: str) -> None:
         if not self._selected_plan_id:
             return
@@ -1447,7 +1645,7 @@ class TaskHudWindow(QWidget):
 
         self._selected_bucket_id = chosen_id
         self._defaults[plan_id] = chosen_id
-        _save_defaults(self._defaults)
+        self._schedule_defaults_save()
         self.set_status_guarded("Alap státusz elmentve.", kind="ok", auto_clear_ms=2000)
 
     def _on_add_clicked(self, title: str, due: str) -> None:
@@ -1499,30 +1697,38 @@ class TaskHudWindow(QWidget):
             self._toggle_add_panel()
         self.start_refresh(skip_intro=True)
 
-    def start_refresh(self, skip_intro: bool = True) -> None:
-        if self._is_refreshing or self._global_edit_mode:
+    def start_refresh(self, skip_intro: bool = True, supersede: bool = False) -> None:
+        # Futó lekérés mellett a kérés egyetlen utólagos lekéréssé vonódik össze; a felhasználói
+        # frissítés a régóta (elakadva) futó lekérést le is váltja
+        if self._global_edit_mode:
             return
-        self._is_refreshing = True
-        self.header.set_busy(True)
+        if not skip_intro:
+            self._refresh_intro = True
+        self._fetcher.request(FETCH_SUPERSEDE_MS if supersede else None)
 
+    def _on_fetch_started(self, generation: int) -> None:
+        self.header.set_busy(True)
         if not self._startup_banner_active and not self._hotkey_banner_active:
             self.header.set_text("Frissítés...")
+        perf_trace.begin("refresh")
+        self._perf_open = perf_trace.ENABLED
 
-        self._busy_guard.start(BUSY_GUARD_MS)
-
-        start_fetch(lambda data: self._on_fetched(data, skip_intro))
-
-    def _on_fetched(self, data, skip_intro: bool) -> None:
-        try:
-            if self._busy_guard.isActive():
-                self._busy_guard.stop()
-        except Exception:
-            pass
+    def _on_fetched_page(self, data, generation: int = 0) -> None:
+        # Csak üres listánál rajzolunk részleges oldalt; utána megvárjuk a teljes választ
+        if self._last_tasks or self._global_edit_mode or not isinstance(data, list) or not data:
+            return
+        tasks_vm = self._apply_pending_mutations(self._tasks_from_data(data))
+        self._update_header_counts(tasks_vm)
+        self._render_tasks(tasks_vm)
 
-        self._is_refreshing = False
+    def _on_fetched(self, data, fingerprint: str = "", seq: int = 0) -> None:
         self.header.set_busy(False)
+        # A felhasználói frissítés hangja csak ehhez a válaszhoz tartozik, hibánál is elengedjük
+        intro = self._refresh_intro
+        self._refresh_intro = False
 
         if isinstance(data, dict) and "error" in data:
+            self._finish_perf(error=True)
             err = str(data.get("error") or "")
             if "Nincs bejelentkezve" in err:
                 self._update_ui_for_logged_out()
@@ -1532,42 +1738,62 @@ class TaskHudWindow(QWidget):
             return
 
         if not isinstance(data, list):
+            self._finish_perf(error=True)
             self.set_status_guarded("Ismeretlen válasz", kind="warn", auto_clear_ms=3000)
             return
 
         self._update_ui_for_logged_in()
 
-        tasks_vm: list[TaskViewModel] = []
-        for t in data:
-            tasks_vm.append(
-                TaskViewModel(
-                    id=str(t.get("id", "")),
-                    title=str(t.get("title", "")),
-                    status=str(t.get("status", "")),
-                    due=str(t.get("date", "")),
-                    priority=str(t.get("priority", "medium")),
-                )
-            )
+        if intro:
+            play_sound(STARTSOUND)
+
+        # Változatlan tartalom: nincs újraépítés, újrarajzolás, görgetés-visszaállítás
+        if fingerprint and fingerprint == self._last_fingerprint and self._last_tasks:
+            self._drop_seen_mutations(seq)
+            self._restore_counts_after_refresh()
+            self._finish_perf(unchanged=True)
+            return
+        self._last_fingerprint = fingerprint or None
+
+        with perf_trace.stage("viewmodel"):
+            tasks_vm = self._apply_pending_mutations(self._tasks_from_data(data))
+        self._drop_seen_mutations(seq)
 
         self._update_header_counts(tasks_vm)
 
-        if not skip_intro:
-            play_sound(STARTSOUND)
+        with perf_trace.stage("render"):
+            self._render_tasks(tasks_vm)
+        if self._render_pos >= len(self._render_entries):
+            self._finish_perf()
 
-        self._render_tasks(tasks_vm)
+    def _finish_perf(self, **extra) -> None:
+        # A minta a (szeletelt) renderelés végén zárul; az összegzés a fejléc overlay-be kerül
+        if not self._perf_open:
+            return
+        self._perf_open = False
+        perf_trace.add("cards_total", len(self._cards_by_id))
+        record = perf_trace.finish(**extra)
+        if record:
+            self.header.set_perf_text(perf_trace.summary(record))
+
+    def _restore_counts_after_refresh(self) -> None:
+        if self._startup_banner_active or self._hotkey_banner_active:
+            return
+        if self._status_clear_timer.isActive():
+            return
+        self._restore_counts_text()
+
+    def _tasks_from_data(self, data: list) -> list[TaskViewModel]:
+        # Csoport, szín és rendezési kulcs frissítésenként egyszer, a mai naphoz számolva
+        return view_models(data)
 
     def _update_header_counts(self, tasks: list[TaskViewModel]) -> None:
-        today = datetime.now().date()
         active = 0
         expired = 0
         for t in tasks:
-            if t.status == "FOLYAMATBAN":
+            if t.status == Status.ACTIVE:
                 active += 1
-                try:
-                    dued = datetime.strptime(t.due, "%Y-%m-%d").date() if t.due and t.due != "Nincs határidő" else None
-                except Exception:
-                    dued = None
-                if dued and dued < today:
+                if t.tone == Tone.OVERDUE:
                     expired += 1
 
         self._last_counts_active = active
@@ -1580,11 +1806,25 @@ class TaskHudWindow(QWidget):
             self.header.set_counts(active=active, expired=expired)
 
     def _clear_task_widgets(self) -> None:
+        self._render_gen += 1
+        self._render_entries = []
         while self.scroll_layout.count() > 1:
             item = self.scroll_layout.takeAt(0)
             w = item.widget()
             if w is not None:
                 w.deleteLater()
+        self._cards_by_id.clear()
+        for hdr in self._section_headers.values():
+            hdr.deleteLater()
+        self._section_headers.clear()
+        self._section_tasks = {}
+        self.task_view.set_tasks([])
+        # A rejtett (épp nem használt) elválasztó és lapozó is megszűnik
+        for w in (self._done_separator, self._pager):
+            if w is not None:
+                w.deleteLater()
+        self._done_separator = None
+        self._pager = None
 
     def _prev_page(self) -> None:
         if self._completed_page > 1:
@@ -1592,7 +1832,7 @@ class TaskHudWindow(QWidget):
             self._render_tasks(self._last_tasks)
 
     def _next_page(self) -> None:
-        done_count = sum(1 for t in self._last_tasks if t.status == "KESZ")
+        done_count = sum(1 for t in self._last_tasks if t.status == Status.DONE)
         max_pages = max(1, (done_count + 11) // 12)
         if self._completed_page < max_pages:
             self._completed_page += 1
@@ -1600,141 +1840,389 @@ class TaskHudWindow(QWidget):
 
     def _render_tasks(self, tasks: list[TaskViewModel]) -> None:
         self._last_tasks = tasks
-        self._clear_task_widgets()
 
-        today = datetime.now().date()
+        # A keresőindex csak a változott címekkel frissül; aktív szűrésnél az eredmény újraszámolódik
+        if self._search_index.sync(tasks) and self._filter_ids is not None:
+            self._filter_ids = self._search_index.search(self.search_edit.text())
 
-        def sort_key(t: TaskViewModel):
-            if t.due and t.due != "Nincs határidő":
-                try:
-                    dued = datetime.strptime(t.due, "%Y-%m-%d").date()
-                    diff = (dued - today).days
-                except Exception:
-                    dued = None
-                    diff = 9999
-            else:
-                dued = None
-                diff = 9999
-
-            if t.status == "FOLYAMATBAN":
-                if diff < 0:
-                    group = 0
-                elif diff <= 7:
-                    group = 1
-                elif diff == 9999:
-                    group = 3
-                else:
-                    group = 2
-
-                diff_sort = diff if diff != 9999 else 999999
-                date_sort = dued.toordinal() if dued else 999999999
-                return (0, group, diff_sort, date_sort, t.title.lower())
-
-            if diff == 9999:
-                sort_val = 999999999
-            else:
-                sort_val = -diff
+        tasks_sorted = sorted(tasks, key=lambda t: t.sort_key)
+        self._task_index.rebuild(tasks_sorted)
 
-            return (1, sort_val, t.title.lower())
-
-        tasks_sorted = sorted(tasks, key=sort_key)
-
-        active_tasks = [t for t in tasks_sorted if t.status == "FOLYAMATBAN"]
-        done_tasks = [t for t in tasks_sorted if t.status == "KESZ"]
+        if self._use_virtual_list(tasks_sorted):
+            self._render_virtual(tasks_sorted)
+            return
+        if self.list_stack.currentWidget() is not self.scroll:
+            self.task_view.set_tasks([])
+            self.list_stack.setCurrentWidget(self.scroll)
+            self.btn_edit_all.setDisabled(False)
+            self.btn_edit_all.setToolTip("")
 
-        for t in active_tasks:
-            card = TaskCard(t)
-            card.done_clicked.connect(self._on_done)
-            card.reopen_clicked.connect(self._on_reopen)
-            card.delete_clicked.connect(self._on_delete)
-            self.scroll_layout.insertWidget(self.scroll_layout.count() - 1, card)
+        active_tasks = [t for t in tasks_sorted if t.status == Status.ACTIVE]
+        done_tasks = [t for t in tasks_sorted if t.status == Status.DONE]
 
-        if done_tasks:
+        # A megjelenítendő elemek sorrendje: meglévő (újrahasznosított) widget, vagy még
+        # megépítendő kártya helyén a feladat maga
+        if self._group_by_plan:
+            wanted: list = self._grouped_entries()
+        else:
+            wanted = [self._reuse_card(t) for t in active_tasks]
+            for hdr in self._section_headers.values():
+                hdr.deleteLater()
+            self._section_headers.clear()
+            self._section_tasks = {}
+
+        # Csoportosított nézetben a kész feladatok a saját szakaszuk kész csoportjában vannak
+        if done_tasks and not self._group_by_plan:
             max_pages = max(1, (len(done_tasks) + 11) // 12)
             if self._completed_page > max_pages:
                 self._completed_page = max_pages
             elif self._completed_page < 1:
                 self._completed_page = 1
 
-            self.scroll_layout.insertWidget(self.scroll_layout.count() - 1, SeparatorLine())
+            if self._done_separator is None:
+                self._done_separator = SeparatorLine()
+            wanted.append(self._done_separator)
 
             if max_pages > 1:
-                pag_widget = QWidget()
-                pag_widget.setStyleSheet("background: transparent; border: 0px;")
-                pag_layout = QHBoxLayout(pag_widget)
-                pag_layout.setContentsMargins(0, 10, 0, 10)
-                pag_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-                btn_prev = MinimalButton("left", icon_size=28)
-                btn_prev.clicked.connect(self._prev_page)
-                if self._completed_page == 1:
-                    btn_prev.setDisabled(True)
-
-                lbl_page = QLabel(f"{self._completed_page} / {max_pages}")
-                lbl_page.setStyleSheet("color: #FFFFFF; font-size: 14px; font-weight: bold; background: transparent;")
-                lbl_page.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-                btn_next = MinimalButton("right", icon_size=28)
-                btn_next.clicked.connect(self._next_page)
-                if self._completed_page == max_pages:
-                    btn_next.setDisabled(True)
-
-                pag_layout.addWidget(btn_prev)
-                pag_layout.addSpacing(15)
-                pag_layout.addWidget(lbl_page)
-                pag_layout.addSpacing(15)
-                pag_layout.addWidget(btn_next)
-
-                self.scroll_layout.insertWidget(self.scroll_layout.count() - 1, pag_widget)
+                pager = self._ensure_pager()
+                pager.lbl_page.setText(f"{self._completed_page} / {max_pages}")
+                pager.btn_prev.setDisabled(self._completed_page == 1)
+                pager.btn_next.setDisabled(self._completed_page == max_pages)
+                wanted.append(pager)
 
             start_idx = (self._completed_page - 1) * 12
             end_idx = start_idx + 12
-            page_tasks = done_tasks[start_idx:end_idx]
+            wanted.extend(self._reuse_card(t) for t in done_tasks[start_idx:end_idx])
+
+        self._render_gen += 1
+        self._render_entries = wanted
+        self._render_pos = 0
+        self._render_slice(self._render_gen, first=True)
+
+    def _reuse_card(self, task: TaskViewModel):
+        card = self._cards_by_id.get(task.id)
+        if card is None:
+            return task
+        card.set_task(task)
+        return card
+
+    def _render_slice(self, gen: int, first: bool = False) -> None:
+        # Új kártyák építése képkocka-kereten belül; a maradék a következő eseményciklusra marad
+        if gen != self._render_gen:
+            return
+        entries = self._render_entries
+        deadline = time.perf_counter() + RENDER_FRAME_BUDGET_MS / 1000.0
+        min_new = max(4, self.scroll.viewport().height() // RENDER_CARD_HEIGHT_EST + 1) if first else 1
+        made = 0
+        pos = self._render_pos
+        while pos < len(entries):
+            e = entries[pos]
+            if isinstance(e, TaskViewModel):
+                if made >= min_new and time.perf_counter() >= deadline:
+                    break
+                entries[pos] = self._card_for(e)
+                made += 1
+            pos += 1
+        self._render_pos = pos
+
+        self._reconcile_task_widgets([e for e in entries if not isinstance(e, TaskViewModel)])
+
+        if pos < len(entries):
+            QTimer.singleShot(0, lambda: self._continue_render(gen))
+        elif not first:
+            self._finish_perf()
+
+    def _continue_render(self, gen: int) -> None:
+        with perf_trace.stage("render"):
+            self._render_slice(gen)
+
+    def _grouped_entries(self) -> list:
+        # Kitűzött (PLANNERCONFIG) tervek elöl, akkor is, ha épp nincs feladatuk; utánuk a többi
+        # terv cím szerint. Szakaszonként az aktív kártyák, majd egy (alapból becsukott) kész csoport.
+        # A becsukott szakasznak / csoportnak csak a fejléce kerül a listába.
+        sections: dict[str, tuple[list, list]] = {pid: ([], []) for pid in _PINNED_PLANS}
+        others = []
+        for pid in self._task_index.plan_ids():
+            tasks = self._task_index.tasks_in_plan(pid)
+            group = (
+                [t for t in tasks if t.status == Status.ACTIVE],
+                [t for t in tasks if t.status == Status.DONE],
+            )
+            key = pid or ""
+            if key in sections:
+                sections[key] = group
+            else:
+                others.append((key, group))
+        others.sort(key=lambda kv: _natural_sort_key(self._section_title(kv[0])))
+        sections.update(others)
+        self._section_tasks = sections
+
+        keys = set(sections) | {k + _DONE_GROUP_SUFFIX for k, (_active, done) in sections.items() if done}
+        for key in [k for k in self._section_headers if k not in keys]:
+            self._section_headers.pop(key).deleteLater()
+
+        entries: list = []
+        for key, (active, done) in sections.items():
+            entries.append(self._section_header(key))
+            if not self._section_open(key):
+                continue
+            entries.extend(self._reuse_card(t) for t in active)
+            if done:
+                done_key = key + _DONE_GROUP_SUFFIX
+                entries.append(self._section_header(done_key))
+                if self._section_open(done_key):
+                    entries.extend(self._reuse_card(t) for t in done)
+        return entries
+
+    def _section_header(self, key: str) -> PlanSectionHeader:
+        hdr = self._section_headers.get(key)
+        if hdr is None:
+            hdr = PlanSectionHeader(key)
+            if key.endswith(_DONE_GROUP_SUFFIX):
+                set_style_prop(hdr, "group", "done")
+            hdr.toggled.connect(self._on_section_toggled)
+            self._section_headers[key] = hdr
+        return hdr
+
+    def _section_title(self, key: str) -> str:
+        if not key:
+            return "(Terv nélkül)"
+        return self._plan_titles.get(key) or _PINNED_PLANS.get(key) or "(Ismeretlen terv)"
+
+    def _section_open(self, key: str) -> bool:
+        # Alapból a kitűzött tervek nyitottak; a felhasználó választása megmarad
+        return bool(self._plan_open.get(key, key in _PINNED_PLANS))
+
+    def _update_section_headers(self) -> None:
+        ids = self._filter_ids
+        for key, hdr in self._section_headers.items():
+            if key.endswith(_DONE_GROUP_SUFFIX):
+                done = self._section_tasks.get(key[:-len(_DONE_GROUP_SUFFIX)], ([], []))[1]
+                matches = None if ids is None else sum(1 for t in done if t.id in ids)
+                hdr.set_info("Kész", len(done), 0, False, matches)
+            else:
+                active, done = self._section_tasks.get(key, ([], []))
+                overdue = sum(1 for t in active if t.tone == Tone.OVERDUE)
+                matches = None if ids is None else sum(1 for t in active + done if t.id in ids)
+                hdr.set_info(self._section_title(key), len(active), overdue, key in _PINNED_PLANS, matches)
+            hdr.set_expanded(self._section_open(key))
+            if self.scroll_layout.indexOf(hdr) >= 0:
+                hdr.setVisible(matches is None or matches > 0)
+
+    def _on_section_toggled(self, key: str) -> None:
+        # Csoportos szerkesztés közben a becsukás elvinné a szerkesztett kártyákat
+        if self._global_edit_mode:
+            return
+        self._plan_open[key] = not self._section_open(key)
+        self._defaults[_PLAN_OPEN_KEY] = self._plan_open
+        self._schedule_defaults_save()
+        self._render_tasks(self._last_tasks)
 
-            for t in page_tasks:
-                card = TaskCard(t)
-                card.done_clicked.connect(self._on_done)
-                card.reopen_clicked.connect(self._on_reopen)
-                card.delete_clicked.connect(self._on_delete)
-                self.scroll_layout.insertWidget(self.scroll_layout.count() - 1, card)
+    def _on_group_toggled(self, checked: bool) -> None:
+        if checked == self._group_by_plan:
+            return
+        self._group_by_plan = checked
+        self._defaults[_GROUP_VIEW_KEY] = checked
+        self._schedule_defaults_save()
+        if self._last_tasks:
+            self._render_tasks(self._last_tasks)
+
+    def _use_virtual_list(self, tasks: list[TaskViewModel]) -> bool:
+        # A csoportosított nézetben a becsukott szakaszok tartják kicsiben a kártyaszámot
+        if VIRTUAL_LIST_THRESHOLD is None or self._global_edit_mode or self._group_by_plan:
+            return False
+        return sum(1 for t in tasks if t.is_active) >= VIRTUAL_LIST_THRESHOLD
+
+    def _render_virtual(self, tasks_sorted: list[TaskViewModel]) -> None:
+        # Nagy listánál nincs kártya-widget és lapozás: a nézet csak a látható sorokat rajzolja
+        self._render_gen += 1
+        self._render_entries = []
+        self._render_pos = 0
+        if self.list_stack.currentWidget() is not self.task_view:
+            self._clear_task_widgets()
+            self.list_stack.setCurrentWidget(self.task_view)
+            self.btn_edit_all.setDisabled(True)
+            self.btn_edit_all.setToolTip("Nagy feladatlistánál a csoportos szerkesztés nem érhető el")
+        self.task_view.set_filter(self._filter_ids)
+        self.task_view.set_tasks(tasks_sorted)
+
+    def _card_for(self, task: TaskViewModel) -> TaskCard:
+        card = self._cards_by_id.get(task.id)
+        if card is not None:
+            card.set_task(task)
+            return card
+        card = TaskCard(task)
+        perf_trace.add("cards_built")
+        card.done_clicked.connect(self._on_done)
+        card.reopen_clicked.connect(self._on_reopen)
+        card.delete_clicked.connect(self._on_delete)
+        if self._global_edit_mode and task.status == Status.ACTIVE:
+            card.set_edit_mode(True)
+            card.content_changed.connect(self._check_edit_changes, Qt.ConnectionType.UniqueConnection)
+        self._cards_by_id[task.id] = card
+        return card
+
+    def _ensure_pager(self) -> QWidget:
+        if self._pager is not None:
+            return self._pager
+        pag_widget = QWidget()
+        pag_widget.setStyleSheet("background: transparent; border: 0px;")
+        pag_layout = QHBoxLayout(pag_widget)
+        pag_layout.setContentsMargins(0, 10, 0, 10)
+        pag_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        btn_prev = MinimalButton("left", icon_size=28)
+        btn_prev.clicked.connect(self._prev_page)
+
+        lbl_page = QLabel()
+        lbl_page.setStyleSheet("color: #FFFFFF; font-size: 14px; font-weight: bold; background: transparent;")
+        lbl_page.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        btn_next = MinimalButton("right", icon_size=28)
+        btn_next.clicked.connect(self._next_page)
+
+        pag_layout.addWidget(btn_prev)
+        pag_layout.addSpacing(15)
+        pag_layout.addWidget(lbl_page)
+        pag_layout.addSpacing(15)
+        pag_layout.addWidget(btn_next)
+
+        pag_widget.btn_prev = btn_prev
+        pag_widget.btn_next = btn_next
+        pag_widget.lbl_page = lbl_page
+        self._pager = pag_widget
+        return pag_widget
+
+    def _reconcile_task_widgets(self, wanted: list[QWidget]) -> None:
+        keep = set(map(id, wanted))
+
+        # Eltűnt elemek: csak ezek törlődnek (a kártyák a pool-ból is kikerülnek)
+        for i in range(self.scroll_layout.count() - 2, -1, -1):
+            w = self.scroll_layout.itemAt(i).widget()
+            if w is not None and id(w) not in keep:
+                self.scroll_layout.takeAt(i)
+                if isinstance(w, TaskCard):
+                    if self._cards_by_id.get(w.task.id) is w:
+                        del self._cards_by_id[w.task.id]
+                    w.deleteLater()
+                else:
+                    w.hide()
+        for tid in [tid for tid, c in self._cards_by_id.items() if id(c) not in keep]:
+            self._cards_by_id.pop(tid).deleteLater()
+
+        # Sorrend igazítása: a leghosszabb változatlan sorrendű részsor marad,
+        # csak a többi widget kerül át a megelőzője mögé
+        layout = self.scroll_layout
+        current = [layout.itemAt(i).widget() for i in range(layout.count())]
+        stay = in_order_ids([id(w) for w in current if w is not None], [id(w) for w in wanted])
+        for pos, w in enumerate(wanted):
+            if id(w) in stay:
+                continue
+            dest = 0 if pos == 0 else layout.indexOf(wanted[pos - 1]) + 1
+            src = layout.indexOf(w)
+            if src == dest:
+                continue
+            if src >= 0:
+                layout.removeWidget(w)
+                if src < dest:
+                    dest -= 1
+            layout.insertWidget(dest, w)
+            w.show()
+
+        self._apply_card_filter()
+
+    def _on_filter_changed(self, text: str) -> None:
+        # Szűrés csak láthatóság / modell-sorok váltásával, kártyák újraépítése nélkül
+        self._filter_ids = self._search_index.search(text)
+        if self.list_stack.currentWidget() is self.task_view:
+            self.task_view.set_filter(self._filter_ids)
+        else:
+            self._apply_card_filter()
+
+    def _apply_card_filter(self) -> None:
+        ids = self._filter_ids
+        any_done = False
+        for card in self._cards_by_id.values():
+            show = ids is None or card.task.id in ids
+            if card.isHidden() == show:
+                card.setVisible(show)
+            if show and card.task.status == Status.DONE:
+                any_done = True
+        sep = self._done_separator
+        if sep is not None and self.scroll_layout.indexOf(sep) >= 0:
+            sep.setVisible(ids is None or any_done)
+        if self._section_headers:
+            self._update_section_headers()
 
     def _on_done(self, task_id: str, title: str) -> None:
-        if not self._startup_banner_active and not self._hotkey_banner_active:
-            self.header.set_text("Frissítés...")
-        
-        def _cb(ok: bool, msg: str):
-            if ok:
-                play_sound(COMPLETESOUND)
-                self.start_refresh(skip_intro=True)
-            else:
-                self.set_status_guarded(msg or "Sikertelen", kind="error", auto_clear_ms=3000)
-                
-        start_action("complete_task", (task_id, title), _cb)
+        if self._mutate_locally(task_id, "done"):
+            play_sound(COMPLETESOUND)
+            start_action("complete_task", (task_id, title),
+                         lambda ok, msg: self._on_mutation_confirmed(task_id, ok, msg or "Sikertelen"))
 
     def _on_reopen(self, task_id: str, title: str) -> None:
-        if not self._startup_banner_active and not self._hotkey_banner_active:
-            self.header.set_text("Frissítés...")
-            
-        def _cb(ok: bool, msg: str):
-            if ok:
-                play_sound(REOPENSOUND)
-                self.start_refresh(skip_intro=True)
-            else:
-                self.set_status_guarded(msg or "Sikertelen", kind="error", auto_clear_ms=3000)
-                
-        start_action("reopen_task", (task_id, title), _cb)
+        if self._mutate_locally(task_id, "reopen"):
+            play_sound(REOPENSOUND)
+            start_action("reopen_task", (task_id, title),
+                         lambda ok, msg: self._on_mutation_confirmed(task_id, ok, msg or "Sikertelen"))
 
     def _on_delete(self, task_id: str, title: str) -> None:
-        if not self._startup_banner_active and not self._hotkey_banner_active:
-            self.header.set_text("Törlés...")
-            
-        def _cb(ok: bool, msg: str):
-            if ok:
-                self.start_refresh(skip_intro=True)
-            else:
-                self.set_status_guarded(msg or "Törlés sikertelen", kind="error", auto_clear_ms=3000)
-                
-        start_action("delete_task", (task_id,), _cb)
+        if self._mutate_locally(task_id, "delete"):
+            start_action("delete_task", (task_id,),
+                         lambda ok, msg: self._on_mutation_confirmed(task_id, ok, msg or "Törlés sikertelen"))
+
+    def _mutate_locally(self, task_id: str, kind: str) -> bool:
+        # Optimista módosítás: azonnal látszik, a Graph írás a háttérben erősíti meg
+        if task_id in self._pending_mutations and self._pending_mutations[task_id]["confirmed_seq"] is None:
+            return False
+        original = next((t for t in self._last_tasks if t.id == task_id), None)
+        if original is None:
+            return False
+        self._pending_mutations[task_id] = {"kind": kind, "original": original, "confirmed_seq": None}
+        self._rerender_local(self._apply_pending_mutations(self._last_tasks))
+        return True
+
+    def _on_mutation_confirmed(self, task_id: str, ok: bool, msg: str) -> None:
+        entry = self._pending_mutations.get(task_id)
+        if entry is None:
+            return
+        if ok:
+            # A következő, ezután induló frissítésig az átfedés marad, hogy egy korábban indult
+            # (még régi állapotot hozó) lekérés ne hozza vissza a kártyát
+            entry["confirmed_seq"] = self._fetcher.generation
+            return
+
+        # Csak az érintett feladat áll vissza, a lista többi része változatlan
+        del self._pending_mutations[task_id]
+        original = entry["original"]
+        tasks = [t for t in self._last_tasks if t.id != task_id]
+        tasks.append(original)
+        self._rerender_local(tasks)
+        self.set_status_guarded(msg, kind="error", auto_clear_ms=3000)
+
+    def _apply_pending_mutations(self, tasks: list[TaskViewModel]) -> list[TaskViewModel]:
+        if not self._pending_mutations:
+            return tasks
+        out = []
+        for t in tasks:
+            entry = self._pending_mutations.get(t.id)
+            if entry is None:
+                out.append(t)
+            elif entry["kind"] == "done":
+                out.append(t if t.status == Status.DONE else with_status(t, Status.DONE))
+            elif entry["kind"] == "reopen":
+                out.append(t if t.status == Status.ACTIVE else with_status(t, Status.ACTIVE))
+        return out
+
+    def _drop_seen_mutations(self, seq: int) -> None:
+        # A megerősítés után indult frissítés már a szerver állapotát hozza: az átfedés elengedhető
+        for tid in [tid for tid, e in self._pending_mutations.items()
+                    if e["confirmed_seq"] is not None and seq > e["confirmed_seq"]]:
+            del self._pending_mutations[tid]
+
+    def _rerender_local(self, tasks: list[TaskViewModel]) -> None:
+        self._update_header_counts(tasks)
+        self._render_tasks(tasks)
 
     def _on_edit_all_clicked(self) -> None:
         if not self._global_edit_mode:
@@ -1745,7 +2233,7 @@ class TaskHudWindow(QWidget):
                 item = self.scroll_layout.itemAt(i)
                 if item and item.widget() and isinstance(item.widget(), TaskCard):
                     card = item.widget()
-                    if card.task.status == "FOLYAMATBAN":
+                    if card.task.status == Status.ACTIVE:
                         card.set_edit_mode(True)
                         card.content_changed.connect(self._check_edit_changes, Qt.ConnectionType.UniqueConnection)
         else:
@@ -1758,7 +2246,7 @@ class TaskHudWindow(QWidget):
                     item = self.scroll_layout.itemAt(i)
                     if item and item.widget() and isinstance(item.widget(), TaskCard):
                         card = item.widget()
-                        if card.task.status == "FOLYAMATBAN":
+                        if card.task.status == Status.ACTIVE:
                             try:
                                 card.content_changed.disconnect(self._check_edit_changes)
                             except Exception:
@@ -1773,7 +2261,7 @@ class TaskHudWindow(QWidget):
             item = self.scroll_layout.itemAt(i)
             if item and item.widget() and isinstance(item.widget(), TaskCard):
                 card = item.widget()
-                if card.task.status == "FOLYAMATBAN" and card.has_changes():
+                if card.task.status == Status.ACTIVE and card.has_changes():
                     has_any = True
                     break
 
@@ -1788,10 +2276,10 @@ class TaskHudWindow(QWidget):
             item = self.scroll_layout.itemAt(i)
             if item and item.widget() and isinstance(item.widget(), TaskCard):
                 card = item.widget()
-                if card.task.status == "FOLYAMATBAN" and card.has_changes():
+                if card.task.status == Status.ACTIVE and card.has_changes():
                     if not card.is_date_valid():
                         self.set_status_guarded("Hibás dátum!", kind="error", auto_clear_ms=3000)
-                        card.edit_date.setStyleSheet("border: 1px solid red;")
+                        set_style_prop(card.edit_date, "invalid", True)
                         return
                     cards_to_save.append(card)
 
@@ -1806,12 +2294,23 @@ class TaskHudWindow(QWidget):
         self._pending_saves = len(cards_to_save)
         self._save_errors = []
 
+        changes = []
         for card in cards_to_save:
             t_val, d_val = card.get_changes()
-            start_action(
-                "update_task_details", (card.task.id, t_val, d_val),
-                lambda ok, msg, c=card: self._on_single_save_done(ok, msg, c)
-            )
+            changes.append((card.task.id, t_val, d_val))
+
+        start_call(
+            "update_tasks_details_batch", (changes,),
+            lambda res, cards=cards_to_save: self._on_batch_save_done(res, cards)
+        )
+
+    def _on_batch_save_done(self, results, cards: list[TaskCard]) -> None:
+        if not isinstance(results, list) or len(results) != len(cards):
+            err = str(results.get("error") or "") if isinstance(results, dict) else "Ismeretlen válasz"
+            results = [(False, err)] * len(cards)
+
+        for (ok, msg), card in zip(results, cards):
+            self._on_single_save_done(bool(ok), str(msg or ""), card)
 
     def _on_single_save_done(self, ok: bool, msg: str, card: TaskCard) -> None:
         self._pending_saves -= 1
@@ -1836,6 +2335,8 @@ class TaskHudWindow(QWidget):
                             c.content_changed.disconnect(self._check_edit_changes)
                         except Exception:
                             pass
+                        if c.is_in_edit_mode:
+                            c.set_edit_mode(False)
                 QTimer.singleShot(1000, lambda: self.start_refresh(skip_intro=True))
 
 class _Header(QWidget):
@@ -1891,6 +2392,33 @@ class _Header(QWidget):
         self.btn_toggle.clicked.connect(self.toggle_clicked.emit)
         self.btn_close.clicked.connect(self.close_clicked.emit)
 
+        self.lbl_perf: QLabel | None = None
+        if perf_trace.ENABLED:
+            self.lbl_perf = QLabel(self)
+            self.lbl_perf.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+            self.lbl_perf.setStyleSheet(
+                "color: #8FD3FF; font-size: 9px; background: rgba(0,0,0,0.55); border-radius: 3px; padding: 0px 3px;"
+            )
+            self.lbl_perf.setVisible(False)
+
+    def set_perf_text(self, text: str) -> None:
+        # Fejlesztői overlay (csak bekapcsolt perf_trace mellett létezik)
+        if self.lbl_perf is None:
+            return
+        self.lbl_perf.setText(text)
+        self.lbl_perf.adjustSize()
+        self._place_perf_label()
+        self.lbl_perf.setVisible(bool(text))
+        self.lbl_perf.raise_()
+
+    def _place_perf_label(self) -> None:
+        if self.lbl_perf is not None:
+            self.lbl_perf.move(14, self.height() - self.lbl_perf.height())
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self._place_perf_label()
+
     def set_work_minutes(self, minutes: int | None) -> None:
         self._work_minutes = None if minutes is None else int(minutes)
         self._apply_lbl()
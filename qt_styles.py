@@ -117,23 +117,113 @@ QPushButton:disabled {
     border-color: #2C3A45;
 }
 
-/* Task card */
-.TaskCard {
-    background-color: #12191F;
-    border: 1px solid #2B3A46;
+"""
+
+# Kártya tónusok (háttér, keret) és prioritás színek; a QSS és a festő delegate is innen veszi
+CARD_TONES = {
+    "overdue": ("#860000", "#6D0000"),
+    "week":    ("#836900", "#554400"),
+    "later":   ("#008300", "#005500"),
+    "nodue":   ("#2b3542", "#404040"),
+    "done":    ("#1A1A1A", "#2b2b2b"),
+}
+
+PRIO_COLORS = {
+    "urgent":    "#FF5555",
+    "important": "#FF5555",
+    "medium":    "#FFB86B",
+    "low":       "#55AAFF",
+}
+
+# Task card: egyszer deklarált osztályok, a kártyák csak property-t váltanak (tone, done, prio, invalid)
+TASK_CARD_QSS = """
+QFrame#TaskCard {
     border-radius: 10px;
+    border: 1px solid #2b2b2b;
+    background-color: #1A1A1A;
+}
+QFrame#TaskCard QWidget#TransBg {
+    background: transparent;
+    border: 0px;
+}
+QFrame#TaskCard QLabel {
+    background: transparent;
+    border: 0px;
+}
+QFrame#TaskCard QLineEdit {
+    background: #333333;
+    color: #FFFFFF;
+    border: 1px solid #555555;
+    border-radius: 4px;
+    selection-background-color: #55AAFF;
 }
-.TaskTitle {
+QFrame#TaskCard QLineEdit[invalid="true"] {
+    border: 1px solid red;
+}
+QLabel#TaskTitle {
+    color: #FFFFFF;
+    font-weight: 800;
     font-size: 13px;
+}
+QLabel#TaskTitle[done="true"] {
+    color: #707070;
     font-weight: 700;
-    color: #EAEAEA;
+    font-size: 11px;
 }
-.TaskMeta {
+QLabel#TaskDate {
+    color: #FFFFFF;
+    font-size: 13px;
+}
+QLabel#TaskDate[done="true"] {
+    color: #888888;
     font-size: 11px;
-    color: #EAEAEA;
 }
-.TaskMetaDone {
+QLabel#PrioDot {
+    font-size: 12px;
+}
+QLabel#PrioText {
     font-size: 11px;
-    color: #7C8791;
+    font-weight: 700;
 }
-"""
+QFrame#SeparatorLine {
+    background: #444444;
+    border: 0px;
+    border-radius: 1px;
+}
+QFrame#PlanSection {
+    background: #202020;
+    border: 1px solid #2b2b2b;
+    border-radius: 8px;
+}
+QFrame#PlanSection[pinned="true"] {
+    border: 1px solid #3A4A6A;
+}
+QFrame#PlanSection[group="done"] {
+    margin-left: 16px;
+    background: transparent;
+}
+QFrame#PlanSection QLabel {
+    background: transparent;
+    border: 0px;
+}
+QLabel#PlanTitle {
+    color: #FFFFFF;
+    font-size: 12px;
+    font-weight: 700;
+}
+QLabel#PlanCount {
+    color: #AAB3BB;
+    font-size: 11px;
+}
+QLabel#PlanCount[overdue="true"] {
+    color: #FF6B6B;
+}
+""" + "".join(
+    f'QFrame#TaskCard[tone="{tone}"] {{ background-color: {bg}; border: 1px solid {border}; }}\n'
+    for tone, (bg, border) in CARD_TONES.items()
+) + "".join(
+    f'QLabel#PrioDot[prio="{prio}"], QLabel#PrioText[prio="{prio}"] {{ color: {col}; }}\n'
+    for prio, col in PRIO_COLORS.items()
+)
+
+APP_QSS += TASK_CARD_QSS
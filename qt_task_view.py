@@ -0,0 +1,323 @@
+# qt_task_view.py
+# Virtualizált feladatlista nagy feladatszámhoz: QListView + QAbstractListModel + festő delegate.
+# Csak a látható sorok rajzolódnak, nincs soronkénti widget; a kártya kinézetét és a
+# MinimalButton gombokat (kattintási területtel együtt) a delegate rajzolja ki.
+from __future__ import annotations
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QRectF, QSize, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen
+from PyQt6.QtWidgets import QAbstractItemView, QFrame, QListView, QStyledItemDelegate
+
+from task_model import Status, TaskViewModel, in_order_ids
+from qt_widgets import _card_colors, _prio_label_color, icon_pixmap, ICON_HOVER, ICON_NORMAL
+
+TaskRole = Qt.ItemDataRole.UserRole + 1
+
+PAD_X = 15
+PAD_TOP = 14
+PAD_BOTTOM = 14
+ROW_GAP = 10
+DELETE_BTN = 28
+LEFT_BTN = 30
+CARD_GAP = 8
+SEPARATOR_H = 18
+
+HIT_LEFT = "left"
+HIT_DELETE = "delete"
+
+
+def _font(base: QFont, px: int, weight: QFont.Weight = QFont.Weight.Normal) -> QFont:
+    f = QFont(base)
+    f.setPixelSize(px)
+    f.setWeight(weight)
+    return f
+
+
+class TaskListModel(QAbstractListModel):
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._all: list[TaskViewModel] = []
+        self._filter: set[str] | None = None
+        self._tasks: list[TaskViewModel] = []
+        self._first_done = -1
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._tasks)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._tasks)):
+            return None
+        t = self._tasks[index.row()]
+        if role == TaskRole:
+            return t
+        if role == Qt.ItemDataRole.DisplayRole:
+            return t.title
+        return None
+
+    def set_tasks(self, tasks_sorted: list[TaskViewModel]) -> None:
+        self._all = list(tasks_sorted)
+        self._apply()
+
+    def set_filter(self, ids: set[str] | None) -> None:
+        """Csak a megadott id-jű feladatok sorai maradnak (None: nincs szűrés)."""
+        self._filter = ids
+        self._apply()
+
+    def _apply(self) -> None:
+        ids = self._filter
+        visible = self._all if ids is None else [t for t in self._all if t.id in ids]
+        if visible == self._tasks:
+            return
+        # Nincs reset: sorművelet csak a ténylegesen változott sorokra, így a görgetés a helyén marad
+        root = QModelIndex()
+        keep = {t.id for t in visible}
+        for row in range(len(self._tasks) - 1, -1, -1):
+            if self._tasks[row].id not in keep:
+                self.beginRemoveRows(root, row, row)
+                del self._tasks[row]
+                self.endRemoveRows()
+        # A leghosszabb változatlan sorrendű részsor marad, a többi sor a megelőzője mögé kerül
+        stay = in_order_ids([t.id for t in self._tasks], [t.id for t in visible])
+        for i, t in enumerate(visible):
+            if t.id in stay:
+                continue
+            dest = 0 if i == 0 else self._row_of(visible[i - 1].id) + 1
+            src = self._row_of(t.id)
+            if src < 0:
+                self.beginInsertRows(root, dest, dest)
+                self._tasks.insert(dest, t)
+                self.endInsertRows()
+            elif src != dest:
+                self.beginMoveRows(root, src, src, root, dest)
+                self._tasks.insert(dest - 1 if src < dest else dest, self._tasks.pop(src))
+                self.endMoveRows()
+        changed: list[int] = []
+        relayout = False
+        for i, t in enumerate(visible):
+            cur = self._tasks[i]
+            if cur != t:
+                relayout = relayout or cur.title != t.title or cur.status != t.status
+                self._tasks[i] = t
+                changed.append(i)
+        first_done = next((i for i, t in enumerate(self._tasks) if t.status == Status.DONE), -1)
+        if first_done != self._first_done:
+            relayout = True
+            changed.extend(r for r in (self._first_done, first_done) if 0 <= r < len(self._tasks))
+        self._first_done = first_done
+        for row in sorted(set(changed)):
+            idx = self.index(row, 0)
+            self.dataChanged.emit(idx, idx)
+        if relayout:
+            # Változó sormagasság: a nézet újraméri a sorokat, a görgetési pozíció megmarad
+            self.layoutAboutToBeChanged.emit()
+            self.layoutChanged.emit()
+
+    def _row_of(self, task_id: str) -> int:
+        return next((i for i, t in enumerate(self._tasks) if t.id == task_id), -1)
+
+    def first_done_row(self) -> int:
+        return self._first_done
+
+
+class TaskCardDelegate(QStyledItemDelegate):
+    def __init__(self, view: "TaskListView") -> None:
+        super().__init__(view)
+        self._view = view
+        self.hover: tuple[int, str] | None = None
+        self._height_cache: dict[tuple, int] = {}
+
+    def _fonts(self, active: bool) -> tuple[QFont, QFont]:
+        base = self._view.font()
+        if active:
+            return _font(base, 13, QFont.Weight.ExtraBold), _font(base, 13)
+        return _font(base, 11, QFont.Weight.Bold), _font(base, 11)
+
+    def _title_height(self, task: TaskViewModel, width: int) -> int:
+        key = (task.title, task.status, width)
+        h = self._height_cache.get(key)
+        if h is None:
+            title_font, _ = self._fonts(task.status == Status.ACTIVE)
+            fm = QFontMetrics(title_font)
+            h = fm.boundingRect(QRect(0, 0, max(1, width), 100000), Qt.TextFlag.TextWordWrap, task.title).height()
+            if len(self._height_cache) > 5000:
+                self._height_cache.clear()
+            self._height_cache[key] = h
+        return h
+
+    def geometry(self, rect: QRect, task: TaskViewModel, first_done: bool) -> dict:
+        """A kártya és a gombok helye a sor téglalapján belül (rajzoláshoz és kattintáshoz)."""
+        top = rect.top() + (SEPARATOR_H if first_done else 0)
+        card = QRect(rect.left(), top, rect.width(), rect.bottom() - top - CARD_GAP + 1)
+        title_w = card.width() - 2 * PAD_X - DELETE_BTN - ROW_GAP
+        title_h = self._title_height(task, title_w)
+        top_h = max(title_h, DELETE_BTN)
+        bottom_y = card.top() + PAD_TOP + top_h + ROW_GAP
+        return {
+            "card": card,
+            "title": QRect(card.left() + PAD_X, card.top() + PAD_TOP, title_w, top_h),
+            HIT_DELETE: QRect(card.right() - PAD_X - DELETE_BTN + 1, card.top() + PAD_TOP, DELETE_BTN, DELETE_BTN),
+            HIT_LEFT: QRect(card.left() + PAD_X, bottom_y, LEFT_BTN, LEFT_BTN),
+            "bottom": QRect(card.left() + PAD_X + LEFT_BTN + ROW_GAP, bottom_y,
+                            card.width() - 2 * PAD_X - LEFT_BTN - ROW_GAP, LEFT_BTN),
+        }
+
+    def hit_test(self, rect: QRect, index: QModelIndex, pos) -> str | None:
+        task = index.data(TaskRole)
+        if task is None:
+            return None
+        geo = self.geometry(rect, task, index.row() == index.model().first_done_row())
+        for kind in (HIT_DELETE, HIT_LEFT):
+            if geo[kind].contains(pos):
+                return kind
+        return None
+
+    def sizeHint(self, option, index: QModelIndex) -> QSize:
+        task = index.data(TaskRole)
+        width = self._view.viewport().width()
+        if task is None:
+            return QSize(width, 0)
+        title_w = width - 2 * PAD_X - DELETE_BTN - ROW_GAP
+        top_h = max(self._title_height(task, title_w), DELETE_BTN)
+        h = PAD_TOP + top_h + ROW_GAP + LEFT_BTN + PAD_BOTTOM + CARD_GAP
+        if index.row() == index.model().first_done_row():
+            h += SEPARATOR_H
+        return QSize(width, h)
+
+    def _paint_button(self, painter: QPainter, row: int, kind: str, icon_type: str, rect: QRect) -> None:
+        state = ICON_HOVER if self.hover == (row, kind) else ICON_NORMAL
+        dpr = painter.device().devicePixelRatioF()
+        painter.drawPixmap(rect.topLeft(), icon_pixmap(icon_type, rect.width(), rect.height(), state, dpr))
+
+    def paint(self, painter: QPainter, option, index: QModelIndex) -> None:
+        task = index.data(TaskRole)
+        if task is None:
+            return
+        row = index.row()
+        active = task.status == Status.ACTIVE
+        first_done = row == index.model().first_done_row()
+        geo = self.geometry(option.rect, task, first_done)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+
+        if first_done:
+            sep = QRectF(option.rect.left(), option.rect.top() + (SEPARATOR_H - 2 - CARD_GAP) / 2 + 1, option.rect.width(), 2)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor("#444444"))
+            painter.drawRoundedRect(sep, 1, 1)
+
+        bg, border = _card_colors(task)
+        painter.setPen(QPen(QColor(border), 1))
+        painter.setBrush(QColor(bg))
+        painter.drawRoundedRect(QRectF(geo["card"]).adjusted(0.5, 0.5, -0.5, -0.5), 10, 10)
+
+        title_font, date_font = self._fonts(active)
+        painter.setFont(title_font)
+        painter.setPen(QColor("#FFFFFF" if active else "#707070"))
+        painter.drawText(geo["title"], int(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop) | int(Qt.TextFlag.TextWordWrap), task.title)
+
+        self._paint_button(painter, row, HIT_DELETE, "trash", geo[HIT_DELETE])
+        self._paint_button(painter, row, HIT_LEFT, "check" if active else "undo", geo[HIT_LEFT])
+
+        bottom = geo["bottom"]
+        painter.setFont(date_font)
+        painter.setPen(QColor("#FFFFFF" if active else "#888888"))
+        due_text = task.due if active else f"KÉSZ · {task.due}"
+        painter.drawText(bottom, int(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter), due_text)
+
+        if active:
+            pr_txt, pr_col = _prio_label_color(task.priority)
+            chip_font = _font(self._view.font(), 11, QFont.Weight.Bold)
+            dot_font = _font(self._view.font(), 12)
+            txt_w = QFontMetrics(chip_font).horizontalAdvance(pr_txt)
+            dot_w = QFontMetrics(dot_font).horizontalAdvance("●")
+            painter.setPen(QColor(pr_col))
+            painter.setFont(chip_font)
+            txt_rect = QRect(bottom.right() - txt_w + 1, bottom.top(), txt_w, bottom.height())
+            painter.drawText(txt_rect, int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter), pr_txt)
+            painter.setFont(dot_font)
+            dot_rect = QRect(txt_rect.left() - 4 - dot_w, bottom.top(), dot_w, bottom.height())
+            painter.drawText(dot_rect, int(Qt.AlignmentFlag.AlignCenter), "●")
+
+        painter.restore()
+
+
+class TaskListView(QListView):
+    done_clicked = pyqtSignal(str, str)
+    reopen_clicked = pyqtSignal(str, str)
+    delete_clicked = pyqtSignal(str, str)
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._model = TaskListModel(self)
+        self._delegate = TaskCardDelegate(self)
+        self.setModel(self._model)
+        self.setItemDelegate(self._delegate)
+
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(100)
+        self.setUniformItemSizes(False)
+        self.setMouseTracking(True)
+        self.setAutoFillBackground(False)
+        self.viewport().setAutoFillBackground(False)
+        self.setStyleSheet("QListView { background: transparent; border: 0px; }")
+        self.setViewportMargins(0, 0, 10, 0)
+
+    def set_tasks(self, tasks_sorted: list[TaskViewModel]) -> None:
+        self._delegate.hover = None
+        self._model.set_tasks(tasks_sorted)
+
+    def set_filter(self, ids: set[str] | None) -> None:
+        self._delegate.hover = None
+        self._model.set_filter(ids)
+
+    def _hit(self, pos) -> tuple[QModelIndex, str | None]:
+        index = self.indexAt(pos)
+        if not index.isValid():
+            return index, None
+        return index, self._delegate.hit_test(self.visualRect(index), index, pos)
+
+    def _set_hover(self, hover: tuple[int, str] | None) -> None:
+        if hover == self._delegate.hover:
+            return
+        old = self._delegate.hover
+        self._delegate.hover = hover
+        for h in (old, hover):
+            if h is not None:
+                self.viewport().update(self.visualRect(self._model.index(h[0], 0)))
+        if hover is None:
+            self.viewport().unsetCursor()
+        else:
+            self.viewport().setCursor(Qt.CursorShape.PointingHandCursor)
+
+    def mouseMoveEvent(self, event) -> None:
+        index, kind = self._hit(event.position().toPoint())
+        self._set_hover((index.row(), kind) if kind else None)
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event) -> None:
+        self._set_hover(None)
+        super().leaveEvent(event)
+
+    def mouseReleaseEvent(self, event) -> None:
+        if event.button() == Qt.MouseButton.LeftButton:
+            index, kind = self._hit(event.position().toPoint())
+            task = index.data(TaskRole) if kind else None
+            if task is not None:
+                if kind == HIT_DELETE:
+                    self.delete_clicked.emit(task.id, task.title)
+                elif task.status == Status.ACTIVE:
+                    self.done_clicked.emit(task.id, task.title)
+                else:
+                    self.reopen_clicked.emit(task.id, task.title)
+                event.accept()
+                return
+        super().mouseReleaseEvent(event)
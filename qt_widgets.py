@@ -1,23 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime, date
+from datetime import datetime
 
 from PyQt6.QtCore import Qt, pyqtSignal, QSize, QPointF, QRectF, QEvent
-from PyQt6.QtGui import QPainter, QPen, QColor, QPainterPath, QFont
+from PyQt6.QtGui import QPainter, QPen, QColor, QPainterPath, QFont, QPixmap, QGuiApplication
 from PyQt6.QtWidgets import (
     QWidget, QFrame, QLabel, QHBoxLayout, QVBoxLayout, QPushButton,
     QSizePolicy, QLineEdit
 )
 
-
-@dataclass(frozen=True)
-class TaskViewModel:
-    id: str
-    title: str
-    status: str
-    due: str
-    priority: str  # urgent/important/medium/low
+from task_model import TaskViewModel, Status, Priority, Tone, NO_DUE_TEXT
+from qt_styles import CARD_TONES, PRIO_COLORS
 
 
 def validate_ymd(d: str) -> tuple[bool, str | None]:
@@ -32,41 +25,233 @@ def validate_ymd(d: str) -> tuple[bool, str | None]:
     return True, None
 
 
-def _parse_due(due: str) -> date | None:
-    if not due or due == "Nincs határidő":
-        return None
-    try:
-        return datetime.strptime(due, "%Y-%m-%d").date()
-    except Exception:
-        return None
+_TONE_COLORS = {tone: CARD_TONES[tone.name.lower()] for tone in Tone}
+
+_PRIO_TEXT = {
+    Priority.URGENT:    "Sürgős",
+    Priority.IMPORTANT: "Fontos",
+    Priority.MEDIUM:    "Közepes",
+    Priority.LOW:       "Alacsony",
+}
+_PRIO_LABELS = {p: (txt, PRIO_COLORS[p.name.lower()]) for p, txt in _PRIO_TEXT.items()}
+
+
+def set_style_prop(widget: QWidget, name: str, value) -> None:
+    """Dinamikus QSS property váltása; csak tényleges változáskor polisholja újra a widgetet."""
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    st = widget.style()
+    st.unpolish(widget)
+    st.polish(widget)
 
 
 def _card_colors(task: TaskViewModel) -> tuple[str, str]:
-    if task.status != "FOLYAMATBAN":
-        return ("#1A1A1A", "#2b2b2b")
+    return _TONE_COLORS[task.tone]
 
-    due = _parse_due(task.due)
-    if not due:
-        return ("#2b3542", "#404040")
 
-    today = datetime.now().date()
-    diff = (due - today).days
-    if diff < 0:
-        return ("#860000", "#6D0000")
-    if diff <= 7:
-        return ("#836900", "#554400")
-    return ("#008300", "#005500")
+def _prio_label_color(priority: Priority) -> tuple[str, str]:
+    return _PRIO_LABELS.get(priority, _PRIO_LABELS[Priority.MEDIUM])
 
 
-def _prio_label_color(priority: str) -> tuple[str, str]:
-    p = (priority or "medium").lower()
-    if p == "urgent":
-        return ("Sürgős", "#FF5555")
-    if p == "important":
-        return ("Fontos", "#FF5555")
-    if p == "medium":
-        return ("Közepes", "#FFB86B")
-    return ("Alacsony", "#55AAFF")
+def icon_colors(icon_type: str, enabled: bool, hovered: bool) -> tuple[QColor, QColor, int]:
+    """Ikon- és háttérszín (alfa) egy MinimalButton állapothoz; a festő delegate is ezt használja."""
+    bg_alpha = 0
+    bg_color = QColor("#FFFFFF")
+    color = QColor("#AAB3BB")
+
+    if not enabled:
+        color = QColor("#555555")
+    else:
+        if hovered:
+            bg_alpha = 20
+            color = QColor("#FFFFFF")
+            
+            if icon_type in ["close", "trash"]:
+                color = QColor("#FF5555")
+                bg_color = QColor("#FF5555")
+                bg_alpha = 30
+            elif icon_type == "check" or icon_type == "save":
+                color = QColor("#00FF88")
+                bg_color = QColor("#00FF88")
+                bg_alpha = 20
+
+        if not hovered:
+            if icon_type == "check" or icon_type == "save":
+                color = QColor("#FFFFFF")
+            elif icon_type == "undo":
+                color = QColor("#55AAFF")
+            elif icon_type == "trash":
+                color = QColor("#AA5555")
+            elif icon_type == "edit":
+                color = QColor("#FFFFFF")
+
+    return color, bg_color, bg_alpha
+
+
+def paint_icon(painter: QPainter, icon_type: str, rect: QRectF, color: QColor) -> None:
+    """A MinimalButton vektoros ikonjának megrajzolása a megadott téglalapba."""
+    pen = QPen(color)
+    pen.setWidthF(1.8)
+    pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+    pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
+    painter.setPen(pen)
+    painter.setBrush(Qt.BrushStyle.NoBrush)
+
+    cx = rect.center().x()
+    cy = rect.center().y()
+
+    if icon_type in ["refresh", "undo"]:
+        font = QFont("Segoe UI Symbol", 15)
+        painter.setFont(font)
+        text_rect = QRectF(rect).translated(0, -2.2)
+        symbol = "↻" if icon_type == "refresh" else "↺"
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, symbol)
+
+    elif icon_type == "close":
+        d = rect.width() * 0.16
+        painter.drawLine(QPointF(cx - d, cy - d), QPointF(cx + d, cy + d))
+        painter.drawLine(QPointF(cx + d, cy - d), QPointF(cx - d, cy + d))
+
+    elif icon_type == "down":
+        d = rect.width() * 0.18
+        painter.drawPolyline([
+            QPointF(cx - d, cy - d/2),
+            QPointF(cx, cy + d/2),
+            QPointF(cx + d, cy - d/2)
+        ])
+
+    elif icon_type == "up":
+        d = rect.width() * 0.18
+        painter.drawPolyline([
+            QPointF(cx - d, cy + d/2),
+            QPointF(cx, cy - d/2),
+            QPointF(cx + d, cy + d/2)
+        ])
+        
+    elif icon_type == "left":
+        d = rect.width() * 0.18
+        painter.drawPolyline([
+            QPointF(cx + d/2, cy - d),
+            QPointF(cx - d/2, cy),
+            QPointF(cx + d/2, cy + d)
+        ])
+
+    elif icon_type == "right":
+        d = rect.width() * 0.18
+        painter.drawPolyline([
+            QPointF(cx - d/2, cy - d),
+            QPointF(cx + d/2, cy),
+            QPointF(cx - d/2, cy + d)
+        ])
+
+    elif icon_type == "check":
+        d = rect.width() * 0.2
+        painter.drawPolyline([
+            QPointF(cx - d, cy),
+            QPointF(cx - d/3, cy + d),
+            QPointF(cx + d, cy - d + 1)
+        ])
+
+    elif icon_type == "trash":
+        w = rect.width() * 0.15
+        h = rect.height() * 0.22
+        painter.drawPolyline([
+            QPointF(cx - w, cy - h/2),
+            QPointF(cx - w + 1, cy + h),
+            QPointF(cx + w - 1, cy + h),
+            QPointF(cx + w, cy - h/2)
+        ])
+        painter.drawLine(QPointF(cx - w - 2, cy - h/2), QPointF(cx + w + 2, cy - h/2))
+        painter.drawLine(QPointF(cx - w/2, cy - h/2), QPointF(cx - w/2, cy - h/2 - 2))
+        painter.drawLine(QPointF(cx + w/2, cy - h/2), QPointF(cx + w/2, cy - h/2 - 2))
+        painter.drawLine(QPointF(cx - w/2, cy - h/2 - 2), QPointF(cx + w/2, cy - h/2 - 2))
+        painter.drawLine(QPointF(cx - w/2 + 0.5, cy - h/2 + 3), QPointF(cx - w/2 + 1, cy + h - 2))
+        painter.drawLine(QPointF(cx + w/2 - 0.5, cy - h/2 + 3), QPointF(cx + w/2 - 1, cy + h - 2))
+    
+    elif icon_type == "edit":
+        painter.save()
+        painter.translate(cx, cy)
+        painter.rotate(45)
+        w = 2.0
+        h = 8.0
+        painter.drawRect(QRectF(-w/2, -h/2, w, h))
+        painter.drawPolygon([
+            QPointF(-w/2, -h/2),
+            QPointF(w/2, -h/2),
+            QPointF(0, -h/2 - 3)
+        ])
+        painter.restore()
+
+    elif icon_type == "save":
+        w = 10
+        h = 10
+        painter.drawRoundedRect(QRectF(cx - w/2, cy - h/2, w, h), 1, 1)
+        painter.drawRect(QRectF(cx - w/3, cy + h/6, w/1.5, h/3))
+
+
+# Előre renderelt ikonok (típus, méret, állapot, DPR) szerint, az egész folyamatra közösen
+ICON_NORMAL = "normal"
+ICON_HOVER = "hover"
+ICON_DISABLED = "disabled"
+
+_ICON_PIXMAPS: dict[tuple, QPixmap] = {}
+_dpi_watch_installed = False
+
+
+def clear_icon_cache() -> None:
+    _ICON_PIXMAPS.clear()
+
+
+def _watch_screen(screen) -> None:
+    screen.logicalDotsPerInchChanged.connect(lambda *_: clear_icon_cache())
+    screen.physicalDotsPerInchChanged.connect(lambda *_: clear_icon_cache())
+
+
+def _ensure_dpi_watch() -> None:
+    # DPI váltáskor (másik monitor, skálázás állítása) a régi pixmapek eldobódnak
+    global _dpi_watch_installed
+    if _dpi_watch_installed:
+        return
+    app = QGuiApplication.instance()
+    if app is None:
+        return
+    _dpi_watch_installed = True
+    for screen in app.screens():
+        _watch_screen(screen)
+    app.screenAdded.connect(_watch_screen)
+    app.screenAdded.connect(lambda *_: clear_icon_cache())
+    app.screenRemoved.connect(lambda *_: clear_icon_cache())
+
+
+def icon_pixmap(icon_type: str, width: int, height: int, state: str, dpr: float) -> QPixmap:
+    """Háttérrel együtt előre megrajzolt ikon; hover/repaint már csak egy drawPixmap."""
+    dpr = round(float(dpr or 1.0), 2)
+    key = (icon_type, width, height, state, dpr)
+    pm = _ICON_PIXMAPS.get(key)
+    if pm is not None:
+        return pm
+
+    _ensure_dpi_watch()
+    pm = QPixmap(max(1, round(width * dpr)), max(1, round(height * dpr)))
+    pm.setDevicePixelRatio(dpr)
+    pm.fill(Qt.GlobalColor.transparent)
+
+    painter = QPainter(pm)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+    rect = QRectF(0, 0, width, height)
+    color, bg_color, bg_alpha = icon_colors(icon_type, state != ICON_DISABLED, state == ICON_HOVER)
+    if bg_alpha > 0:
+        bg_color.setAlpha(bg_alpha)
+        painter.setBrush(bg_color)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.drawRoundedRect(rect, 6, 6)
+    paint_icon(painter, icon_type, rect, color)
+    painter.end()
+
+    _ICON_PIXMAPS[key] = pm
+    return pm
 
 
 class MinimalButton(QPushButton):
@@ -78,144 +263,16 @@ class MinimalButton(QPushButton):
         self.setCursor(Qt.CursorShape.PointingHandCursor)
 
     def paintEvent(self, event) -> None:
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
-
-        bg_alpha = 0
-        bg_color = QColor("#FFFFFF")
-        color = QColor("#AAB3BB")
-
         if not self.isEnabled():
-            color = QColor("#555555")
+            state = ICON_DISABLED
+        elif self.underMouse():
+            state = ICON_HOVER
         else:
-            if self.underMouse():
-                bg_alpha = 20
-                color = QColor("#FFFFFF")
-                
-                if self.icon_type in ["close", "trash"]:
-                    color = QColor("#FF5555")
-                    bg_color = QColor("#FF5555")
-                    bg_alpha = 30
-                elif self.icon_type == "check" or self.icon_type == "save":
-                    color = QColor("#00FF88")
-                    bg_color = QColor("#00FF88")
-                    bg_alpha = 20
-
-            if not self.underMouse():
-                if self.icon_type == "check" or self.icon_type == "save":
-                    color = QColor("#FFFFFF")
-                elif self.icon_type == "undo":
-                    color = QColor("#55AAFF")
-                elif self.icon_type == "trash":
-                    color = QColor("#AA5555")
-                elif self.icon_type == "edit":
-                    color = QColor("#FFFFFF")
-
-        if bg_alpha > 0:
-            bg_color.setAlpha(bg_alpha)
-            painter.setBrush(bg_color)
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawRoundedRect(self.rect(), 6, 6)
-
-        pen = QPen(color)
-        pen.setWidthF(1.8)
-        pen.setCapStyle(Qt.PenCapStyle.RoundCap)
-        pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
-        painter.setPen(pen)
-        painter.setBrush(Qt.BrushStyle.NoBrush)
-
-        cx = self.width() / 2
-        cy = self.height() / 2
-
-        if self.icon_type in ["refresh", "undo"]:
-            font = QFont("Segoe UI Symbol", 15)
-            painter.setFont(font)
-            text_rect = QRectF(self.rect()).translated(0, -2.2)
-            symbol = "↻" if self.icon_type == "refresh" else "↺"
-            painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, symbol)
-
-        elif self.icon_type == "close":
-            d = self.width() * 0.16
-            painter.drawLine(QPointF(cx - d, cy - d), QPointF(cx + d, cy + d))
-            painter.drawLine(QPointF(cx + d, cy - d), QPointF(cx - d, cy + d))
-
-        elif self.icon_type == "down":
-            d = self.width() * 0.18
-            painter.drawPolyline([
-                QPointF(cx - d, cy - d/2),
-                QPointF(cx, cy + d/2),
-                QPointF(cx + d, cy - d/2)
-            ])
-
-        elif self.icon_type == "up":
-            d = self.width() * 0.18
-            painter.drawPolyline([
-                QPointF(cx - d, cy + d/2),
-                QPointF(cx, cy - d/2),
-                QPointF(cx + d, cy + d/2)
-            ])
-            
-        elif self.icon_type == "left":
-            d = self.width() * 0.18
-            painter.drawPolyline([
-                QPointF(cx + d/2, cy - d),
-                QPointF(cx - d/2, cy),
-                QPointF(cx + d/2, cy + d)
-            ])
-
-        elif self.icon_type == "right":
-            d = self.width() * 0.18
-            painter.drawPolyline([
-                QPointF(cx - d/2, cy - d),
-                QPointF(cx + d/2, cy),
-                QPointF(cx - d/2, cy + d)
-            ])
-
-        elif self.icon_type == "check":
-            d = self.width() * 0.2
-            painter.drawPolyline([
-                QPointF(cx - d, cy),
-                QPointF(cx - d/3, cy + d),
-                QPointF(cx + d, cy - d + 1)
-            ])
-
-        elif self.icon_type == "trash":
-            w = self.width() * 0.15
-            h = self.height() * 0.22
-            painter.drawPolyline([
-                QPointF(cx - w, cy - h/2),
-                QPointF(cx - w + 1, cy + h),
-                QPointF(cx + w - 1, cy + h),
-                QPointF(cx + w, cy - h/2)
-            ])
-            painter.drawLine(QPointF(cx - w - 2, cy - h/2), QPointF(cx + w + 2, cy - h/2))
-            painter.drawLine(QPointF(cx - w/2, cy - h/2), QPointF(cx - w/2, cy - h/2 - 2))
-            painter.drawLine(QPointF(cx + w/2, cy - h/2), QPointF(cx + w/2, cy - h/2 - 2))
-            painter.drawLine(QPointF(cx - w/2, cy - h/2 - 2), QPointF(cx + w/2, cy - h/2 - 2))
-            painter.drawLine(QPointF(cx - w/2 + 0.5, cy - h/2 + 3), QPointF(cx - w/2 + 1, cy + h - 2))
-            painter.drawLine(QPointF(cx + w/2 - 0.5, cy - h/2 + 3), QPointF(cx + w/2 - 1, cy + h - 2))
-        
-        elif self.icon_type == "edit":
-            painter.save()
-            painter.translate(cx, cy)
-            painter.rotate(45)
-            w = 2.0
-            h = 8.0
-            painter.drawRect(QRectF(-w/2, -h/2, w, h))
-            painter.drawPolygon([
-                QPointF(-w/2, -h/2),
-                QPointF(w/2, -h/2),
-                QPointF(0, -h/2 - 3)
-            ])
-            painter.restore()
-
-        elif self.icon_type == "save":
-            w = 10
-            h = 10
-            painter.drawRoundedRect(QRectF(cx - w/2, cy - h/2, w, h), 1, 1)
-            painter.drawRect(QRectF(cx - w/3, cy + h/6, w/1.5, h/3))
+            state = ICON_NORMAL
+        pm = icon_pixmap(self.icon_type, self.width(), self.height(), state, self.devicePixelRatioF())
 
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, pm)
         painter.end()
 
     def enterEvent(self, event) -> None:
@@ -230,8 +287,8 @@ class MinimalButton(QPushButton):
 class SeparatorLine(QFrame):
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
+        self.setObjectName("SeparatorLine")
         self.setFixedHeight(2)
-        self.setStyleSheet("QFrame { background:#444444; border:0px; border-radius:1px; }")
 
 
 class TaskCard(QFrame):
@@ -244,29 +301,18 @@ class TaskCard(QFrame):
         super().__init__(parent)
         self.task = task
         self.is_in_edit_mode = False
-        self.original_title = task.title
-        self.original_due = task.due if task.due != "Nincs határidő" else ""
-
-        bg, border = _card_colors(task)
+        self.original_title = ""
+        self.original_due = ""
 
+        self.setObjectName("TaskCard")
         self.setFrameShape(QFrame.Shape.StyledPanel)
         self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
-        self.setStyleSheet(
-            f"QFrame {{ background-color:{bg}; border:1px solid {border}; border-radius:10px; }}"
-            "QWidget#TransBg { background: transparent; border: 0px; }"
-            "QLabel { background: transparent; border:0px; }"
-            "QLineEdit { background: #333333; color: #FFFFFF; border: 1px solid #555555; border-radius: 4px; selection-background-color: #55AAFF; }"
-        )
-
-        self.lbl_title = QLabel(task.title)
+
+        self.lbl_title = QLabel()
+        self.lbl_title.setObjectName("TaskTitle")
         self.lbl_title.setWordWrap(True)
-        if task.status == "FOLYAMATBAN":
-            self.lbl_title.setStyleSheet("color:#FFFFFF; font-weight:800; font-size:13px; background: transparent; border:0px;")
-        else:
-            self.lbl_title.setStyleSheet("color:#707070; font-weight:700; font-size:11px; background: transparent; border:0px;")
-        
+
         self.edit_title = QLineEdit()
-        self.edit_title.setText(self.original_title)
         self.edit_title.setVisible(False)
         self.edit_title.installEventFilter(self)
         self.edit_title.textChanged.connect(self._on_text_changed)
@@ -284,35 +330,24 @@ class TaskCard(QFrame):
         top.addWidget(self.edit_title, 1)
         top.addWidget(self.btn_delete, 0, Qt.AlignmentFlag.AlignTop)
 
-        if task.status == "FOLYAMATBAN":
-            self.btn_left = MinimalButton("check", icon_size=30)
-            self.btn_left.clicked.connect(self._on_done)
-        else:
-            self.btn_left = MinimalButton("undo", icon_size=30)
-            self.btn_left.clicked.connect(self._on_reopen)
+        # Egy gomb mindkét állapothoz: a kattintás a feladat aktuális állapota szerint dönt
+        self.btn_left = MinimalButton("check", icon_size=30)
+        self.btn_left.clicked.connect(self._on_left_clicked)
+
+        self.lbl_date = QLabel()
+        self.lbl_date.setObjectName("TaskDate")
 
-        due_text = task.due if task.due else "-"
-        if task.status == "FOLYAMATBAN":
-            self.lbl_date = QLabel(f"{due_text}")
-            self.lbl_date.setStyleSheet("font-size:13px; color:#FFFFFF; background: transparent; border:0px;")
-        else:
-            self.lbl_date = QLabel(f"KÉSZ · {due_text}")
-            self.lbl_date.setStyleSheet("font-size:11px; color:#888888; background: transparent; border:0px;")
-        
         self.edit_date = QLineEdit()
         self.edit_date.setPlaceholderText("ÉÉÉÉ-HH-NN")
-        self.edit_date.setText(self.original_due)
         self.edit_date.setVisible(False)
         self.edit_date.setFixedWidth(100)
         self.edit_date.installEventFilter(self)
         self.edit_date.textChanged.connect(self._on_text_changed)
 
-        pr_txt, pr_col = _prio_label_color(task.priority)
-
         self.lbl_chip_dot = QLabel("●")
-        self.lbl_chip_dot.setStyleSheet(f"color:{pr_col}; font-size:12px; background: transparent; border:0px;")
-        self.lbl_chip_txt = QLabel(pr_txt)
-        self.lbl_chip_txt.setStyleSheet(f"color:{pr_col}; font-size:11px; font-weight:700; background: transparent; border:0px;")
+        self.lbl_chip_dot.setObjectName("PrioDot")
+        self.lbl_chip_txt = QLabel()
+        self.lbl_chip_txt.setObjectName("PrioText")
 
         chip = QWidget()
         chip.setObjectName("TransBg")
@@ -331,9 +366,8 @@ class TaskCard(QFrame):
         bottom.addWidget(self.lbl_date, 0)
         bottom.addWidget(self.edit_date, 0)
         bottom.addStretch(1)
-        
-        if task.status == "FOLYAMATBAN":
-            bottom.addWidget(chip, 0)
+        bottom.addWidget(chip, 0)
+        self._chip = chip
 
         root = QVBoxLayout(self)
         root.setContentsMargins(0, 0, 0, 0)
@@ -343,6 +377,52 @@ class TaskCard(QFrame):
 
         self.btn_delete.clicked.connect(self._on_delete)
 
+        self._apply_task(task, force=True)
+
+    def set_task(self, task: TaskViewModel) -> bool:
+        """A kártya újrahasznosítása új adattal; csak a ténylegesen változott részeket frissíti."""
+        if task == self.task:
+            return False
+        self._apply_task(task)
+        return True
+
+    def _apply_task(self, task: TaskViewModel, force: bool = False) -> None:
+        old = self.task
+        self.task = task
+        active = task.status == Status.ACTIVE
+
+        # A kinézetet az APP_QSS osztályai adják; itt csak a property-k váltanak
+        set_style_prop(self, "tone", task.tone.name.lower())
+
+        status_changed = force or task.status != old.status
+        if status_changed:
+            set_style_prop(self.lbl_title, "done", not active)
+            set_style_prop(self.lbl_date, "done", not active)
+            self.btn_left.icon_type = "check" if active else "undo"
+            self.btn_left.update()
+            self._chip.setVisible(active)
+            if not active and self.is_in_edit_mode:
+                self.set_edit_mode(False)
+
+        if force or task.title != old.title:
+            self.original_title = task.title
+            self.lbl_title.setText(task.title)
+            if not self.is_in_edit_mode:
+                self.edit_title.setText(task.title)
+
+        if force or status_changed or task.due_ord != old.due_ord:
+            self.original_due = task.due if task.due_ord is not None else ""
+            due_text = task.due if task.due else "-"
+            self.lbl_date.setText(due_text if active else f"KÉSZ · {due_text}")
+            if not self.is_in_edit_mode:
+                self.edit_date.setText(self.original_due)
+
+        if force or task.priority != old.priority:
+            prio = task.priority.name.lower()
+            self.lbl_chip_txt.setText(_PRIO_TEXT.get(task.priority, ""))
+            set_style_prop(self.lbl_chip_dot, "prio", prio)
+            set_style_prop(self.lbl_chip_txt, "prio", prio)
+
     def set_edit_mode(self, active: bool) -> None:
         self.is_in_edit_mode = active
         self.lbl_title.setVisible(not active)
@@ -351,12 +431,12 @@ class TaskCard(QFrame):
         self.edit_date.setVisible(active)
 
         if not active:
-            # Visszaállítás eredeti állapotra, a .setStyleSheet("") pedig törli az esetleges piros hibajelzést
+            # Visszaállítás eredeti állapotra, az invalid property törlése leveszi az esetleges piros hibajelzést
             self.edit_title.setText(self.original_title)
-            self.edit_title.setStyleSheet("")
+            set_style_prop(self.edit_title, "invalid", False)
             
             self.edit_date.setText(self.original_due)
-            self.edit_date.setStyleSheet("")
+            set_style_prop(self.edit_date, "invalid", False)
 
     def has_changes(self) -> bool:
         t_val, d_val = self.get_changes()
@@ -381,7 +461,7 @@ class TaskCard(QFrame):
         self.original_due = d_val
         
         self.lbl_title.setText(t_val)
-        self.lbl_date.setText(d_val if d_val else "Nincs határidő")
+        self.lbl_date.setText(d_val if d_val else NO_DUE_TEXT)
 
     def _on_text_changed(self) -> None:
         if self.is_in_edit_mode:
@@ -397,6 +477,12 @@ class TaskCard(QFrame):
                 return True
         return super().eventFilter(obj, event)
 
+    def _on_left_clicked(self) -> None:
+        if self.task.status == Status.ACTIVE:
+            self._on_done()
+        else:
+            self._on_reopen()
+
     def _on_done(self) -> None:
         self.done_clicked.emit(self.task.id, self.lbl_title.text())
 
@@ -405,3 +491,63 @@ class TaskCard(QFrame):
 
     def _on_delete(self) -> None:
         self.delete_clicked.emit(self.task.id, self.lbl_title.text())
+
+
+class PlanSectionHeader(QFrame):
+    """Összecsukható terv-szakasz fejléce a csoportosított nézetben (kattintásra nyit / zár)."""
+    toggled = pyqtSignal(str)
+
+    def __init__(self, key: str, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.key = key
+        self.expanded = False
+        self._info: tuple | None = None
+
+        self.setObjectName("PlanSection")
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+
+        self.btn_arrow = MinimalButton("right", icon_size=24)
+        self.btn_arrow.clicked.connect(lambda: self.toggled.emit(self.key))
+
+        self.lbl_title = QLabel()
+        self.lbl_title.setObjectName("PlanTitle")
+        self.lbl_count = QLabel()
+        self.lbl_count.setObjectName("PlanCount")
+
+        row = QHBoxLayout(self)
+        row.setContentsMargins(6, 4, 12, 4)
+        row.setSpacing(6)
+        row.addWidget(self.btn_arrow, 0)
+        row.addWidget(self.lbl_title, 1)
+        row.addWidget(self.lbl_count, 0)
+
+    def set_info(self, title: str, active: int, overdue: int, pinned: bool, matches: int | None = None) -> None:
+        info = (title, active, overdue, pinned, matches)
+        if info == self._info:
+            return
+        self._info = info
+        self.lbl_title.setText(title)
+        if matches is not None:
+            text = f"{matches} találat"
+        elif overdue:
+            text = f"{active} · {overdue} lejárt"
+        else:
+            text = str(active)
+        self.lbl_count.setText(text)
+        set_style_prop(self, "pinned", pinned)
+        set_style_prop(self.lbl_count, "overdue", bool(overdue) and matches is None)
+
+    def set_expanded(self, expanded: bool) -> None:
+        self.expanded = expanded
+        icon = "down" if expanded else "right"
+        if self.btn_arrow.icon_type != icon:
+            self.btn_arrow.icon_type = icon
+            self.btn_arrow.update()
+
+    def mousePressEvent(self, event) -> None:
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.toggled.emit(self.key)
+            event.accept()
+            return
+        super().mousePressEvent(event)
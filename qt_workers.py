@@ -2,27 +2,152 @@
 from __future__ import annotations
 
 import traceback
-from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
 
 import backend
+import perf_trace
+
+# Ennyi ideig tartó haladás nélküli lekérés elakadtnak számít: visszavonjuk és hibaként jelezzük.
+# Haladás: minden HTTP válasz, részleges oldal és kivárt throttling; a teljes futásidő nem számít.
+FETCH_TIMEOUT_MS = 30000
+# Felhasználói frissítés az ennyi ideje nem haladó lekérést leváltja (különben összevonódik)
+FETCH_SUPERSEDE_MS = 10000
 
 
 class _Signals(QObject):
     finished = pyqtSignal(object)
+    page = pyqtSignal(object, int)
+    fetched = pyqtSignal(object, str, int)
     action_finished = pyqtSignal(bool, str)
 
 
 class FetchRunnable(QRunnable):
-    def __init__(self):
+    def __init__(self, generation: int = 0, token: backend.CancelToken | None = None, perf_sample=None):
         super().__init__()
+        self.generation = generation
+        self.token = token or backend.CancelToken()
+        self.perf_sample = perf_sample
         self.signals = _Signals()
 
     def run(self) -> None:
+        token = self.token
         try:
-            data = backend.fetch_data()
-            self.signals.finished.emit(data)
+            with backend.cancel_scope(token), perf_trace.scope(self.perf_sample):
+                # Első szinkronnál a részleges oldalakat is továbbadjuk, hogy a UI korán rajzolhasson
+                for final, data in backend.iter_fetch_data():
+                    if token.cancelled:
+                        return
+                    if final:
+                        # A lenyomatot még a háttérszálon számoljuk, a UI csak összehasonlít
+                        self.signals.fetched.emit(data, backend.tasks_fingerprint(data), self.generation)
+                        return
+                    self.signals.page.emit(data, self.generation)
+            if not token.cancelled:
+                self.signals.fetched.emit({"error": "Üres válasz"}, "", self.generation)
         except Exception as e:
-            self.signals.finished.emit({"error": f"{e}\n{traceback.format_exc()}"})
+            if not token.cancelled:
+                self.signals.fetched.emit({"error": f"{e}\n{traceback.format_exc()}"}, "", self.generation)
+
+
+class FetchCoordinator(QObject):
+    """A feladatlekérések sorosítása a UI számára.
+
+    - minden lekérés generációszámot kap, és csak a legutóbbi eredménye jut tovább;
+    - futás közben érkező kérésekből egyetlen utólagos lekérés lesz;
+    - a visszavonás (cancel, elakadás, leváltás) kooperatívan leállítja a futó HTTP láncot.
+    """
+    started = pyqtSignal(int)
+    page = pyqtSignal(object, int)
+    fetched = pyqtSignal(object, str, int)
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._generation = 0
+        self._token: backend.CancelToken | None = None
+        self._follow_up = False
+        self._watchdog = QTimer(self)
+        self._watchdog.setSingleShot(True)
+        self._watchdog.timeout.connect(self._on_timeout)
+
+    @property
+    def generation(self) -> int:
+        """A legutóbb indított lekérés sorszáma."""
+        return self._generation
+
+    def is_busy(self) -> bool:
+        return self._token is not None
+
+    def request(self, supersede_after_ms: int | None = None) -> None:
+        """Lekérés indítása; ha már fut egy, egyetlen utólagos lekérés jegyződik elő.
+
+        supersede_after_ms: az ennyi ideje nem haladó lekérést visszavonja és azonnal újat indít.
+        """
+        if self._token is None:
+            self._launch()
+            return
+        if supersede_after_ms is not None and self._token.idle_s() * 1000 >= supersede_after_ms:
+            self._abort()
+            self._launch()
+            return
+        self._follow_up = True
+
+    def cancel(self) -> None:
+        """A futó lekérés visszavonása (kijelentkezés, bezárás); az előjegyzett kérés is törlődik."""
+        self._follow_up = False
+        self._abort()
+
+    def _abort(self) -> None:
+        # A visszavont lekérés késői jelzéseit a generáció / hiányzó token szűri ki
+        if self._token is not None:
+            self._token.cancel()
+            self._token = None
+        self._watchdog.stop()
+
+    def _launch(self) -> None:
+        self._generation += 1
+        token = backend.CancelToken()
+        self._token = token
+        # A started kezelője nyitja a perf mintát; a lekérés szála ezt kapja meg
+        self.started.emit(self._generation)
+        r = FetchRunnable(self._generation, token, perf_trace.current())
+        r.signals.page.connect(self._on_page)
+        r.signals.fetched.connect(self._on_fetched)
+        self._watchdog.start(FETCH_TIMEOUT_MS)
+        QThreadPool.globalInstance().start(r)
+
+    def _is_current(self, generation: int) -> bool:
+        return self._token is not None and generation == self._generation
+
+    def _on_page(self, data, generation: int) -> None:
+        if self._is_current(generation):
+            self._token.touch()
+            self._watchdog.start(FETCH_TIMEOUT_MS)
+            self.page.emit(data, generation)
+
+    def _on_fetched(self, data, fingerprint: str, generation: int) -> None:
+        if not self._is_current(generation):
+            return
+        self._token = None
+        self._watchdog.stop()
+        self.fetched.emit(data, fingerprint, generation)
+        self._run_follow_up()
+
+    def _on_timeout(self) -> None:
+        if self._token is None:
+            return
+        # A háttérszál a tokenen jelzi a haladást: amíg halad, csak újraindítjuk az órát
+        idle_ms = self._token.idle_s() * 1000
+        if idle_ms < FETCH_TIMEOUT_MS:
+            self._watchdog.start(max(1, int(FETCH_TIMEOUT_MS - idle_ms)))
+            return
+        self._abort()
+        self.fetched.emit({"error": "Időtúllépés"}, "", self._generation)
+        self._run_follow_up()
+
+    def _run_follow_up(self) -> None:
+        if self._follow_up and self._token is None:
+            self._follow_up = False
+            self._launch()
 
 
 class ActionRunnable(QRunnable):
@@ -48,11 +173,42 @@ class ActionRunnable(QRunnable):
             self.signals.action_finished.emit(False, f"{e}\n{traceback.format_exc()}")
 
 
-def start_fetch(slot_finished):
-    r = FetchRunnable()
-    r.signals.finished.connect(slot_finished)
-    QThreadPool.globalInstance().start(r)
-    return r
+class CallRunnable(QRunnable):
+    """Tetszőleges backend függvény; a nyers visszatérési értéket adja tovább.
+
+    Megszakítható (olvasó) hívás visszavonás után nem jelez vissza.
+    """
+
+    def __init__(self, fn_name: str, args: tuple, token: backend.CancelToken | None = None):
+        super().__init__()
+        self.fn_name = fn_name
+        self.args = args
+        self.token = token
+        self.signals = _Signals()
+
+    def _emit(self, res) -> None:
+        if self.token is None or not self.token.cancelled:
+            self.signals.finished.emit(res)
+
+    def run(self) -> None:
+        try:
+            fn = getattr(backend, self.fn_name)
+            with backend.cancel_scope(self.token):
+                res = fn(*self.args)
+            self._emit(res)
+        except Exception as e:
+            self._emit({"error": f"{e}\n{traceback.format_exc()}"})
+
+
+# A megszakítható háttérhívások közös tokenje; cancel_calls() visszavonja és újat kezd
+_calls_token = backend.CancelToken()
+
+
+def cancel_calls() -> None:
+    """Minden futó, megszakíthatóként indított start_call visszavonása (kijelentkezés, bezárás)."""
+    global _calls_token
+    _calls_token.cancel()
+    _calls_token = backend.CancelToken()
 
 
 def start_action(fn_name: str, args: tuple, slot_finished):
@@ -60,3 +216,16 @@ def start_action(fn_name: str, args: tuple, slot_finished):
     r.signals.action_finished.connect(slot_finished)
     QThreadPool.globalInstance().start(r)
     return r
+
+
+def start_background(fn, *args) -> None:
+    """Visszajelzés nélküli háttérmunka (pl. lemezírás) a közös szálkészleten."""
+    QThreadPool.globalInstance().start(lambda: fn(*args))
+
+
+def start_call(fn_name: str, args: tuple, slot_finished, cancellable: bool = False):
+    # Írásokat nem vonunk vissza: csak a tisztán olvasó hívások legyenek megszakíthatók
+    r = CallRunnable(fn_name, args, _calls_token if cancellable else None)
+    r.signals.finished.connect(slot_finished)
+    QThreadPool.globalInstance().start(r)
+    return r
@@ -0,0 +1,215 @@
+# task_model.py
+# Tömör, előfeldolgozott feladat-rekord (Qt nélkül, a backend és a UI is használja).
+# A határidő egyszer, a backendben alakul sorszámmá (date.toordinal), az állapot és a
+# prioritás kis egész enum; a rendezési kulcs és a színcsoport frissítésenként egyszer számolódik.
+# A terv / bucket azonosítók is megmaradnak, a TaskIndex terv szerint csoportosít.
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import date
+from enum import IntEnum
+
+NO_DUE_TEXT = "Nincs határidő"
+WEEK_DAYS = 7
+_NO_DUE_SORT = 999999999
+
+
+class Status(IntEnum):
+    ACTIVE = 0  # FOLYAMATBAN
+    DONE = 1    # KESZ
+
+
+class Priority(IntEnum):
+    URGENT = 0
+    IMPORTANT = 1
+    MEDIUM = 2
+    LOW = 3
+
+
+class Tone(IntEnum):
+    # A sorrend egyben az aktív feladatok csoport-sorrendje
+    OVERDUE = 0
+    WEEK = 1
+    LATER = 2
+    NODUE = 3
+    DONE = 4
+
+
+def priority_from_planner(p_val: int) -> Priority:
+    if p_val <= 1:
+        return Priority.URGENT
+    if p_val <= 4:
+        return Priority.IMPORTANT
+    if p_val <= 7:
+        return Priority.MEDIUM
+    return Priority.LOW
+
+
+def due_ordinal(ymd: str | None) -> int | None:
+    """'ÉÉÉÉ-HH-NN' (vagy hosszabb ISO időbélyeg) -> napsorszám; None, ha nincs vagy hibás."""
+    if not ymd or len(ymd) < 10:
+        return None
+    try:
+        return date.fromisoformat(ymd[:10]).toordinal()
+    except ValueError:
+        return None
+
+
+def due_text(due_ord: int | None) -> str:
+    if due_ord is None:
+        return NO_DUE_TEXT
+    return date.fromordinal(due_ord).isoformat()
+
+
+def _coerce_enum(enum_cls, value, default):
+    try:
+        return enum_cls(int(value))
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass(frozen=True)
+class TaskViewModel:
+    __slots__ = ("id", "title", "status", "due_ord", "priority", "plan_id", "bucket_id", "order_hint",
+                 "assignee_ids", "tone", "sort_key")
+
+    id: str
+    title: str
+    status: Status
+    due_ord: int | None
+    priority: Priority
+    plan_id: str | None
+    bucket_id: str | None
+    order_hint: str
+    assignee_ids: tuple
+    tone: Tone
+    sort_key: tuple
+
+    @property
+    def due(self) -> str:
+        return due_text(self.due_ord)
+
+    @property
+    def is_active(self) -> bool:
+        return self.status == Status.ACTIVE
+
+
+def tone_for(status: Status, due_ord: int | None, today_ord: int) -> Tone:
+    if status != Status.ACTIVE:
+        return Tone.DONE
+    if due_ord is None:
+        return Tone.NODUE
+    diff = due_ord - today_ord
+    if diff < 0:
+        return Tone.OVERDUE
+    if diff <= WEEK_DAYS:
+        return Tone.WEEK
+    return Tone.LATER
+
+
+def view_model(t: dict, today_ord: int) -> TaskViewModel:
+    """Egy formázott (backend) feladat -> TaskViewModel, a mai naphoz számolt csoporttal és kulccsal."""
+    due_ord = t.get("due_ord")
+    return _build(
+        str(t.get("id") or ""),
+        str(t.get("title") or ""),
+        _coerce_enum(Status, t.get("status"), Status.ACTIVE),
+        int(due_ord) if due_ord is not None else None,
+        _coerce_enum(Priority, t.get("priority"), Priority.MEDIUM),
+        t.get("plan_id") or None,
+        today_ord,
+        bucket_id=t.get("bucket_id") or None,
+        order_hint=str(t.get("order_hint") or ""),
+        assignee_ids=tuple(t.get("assignee_ids") or ()),
+    )
+
+
+def with_status(task: TaskViewModel, status: Status, today_ord: int | None = None) -> TaskViewModel:
+    """Ugyanaz a feladat más állapotban (helyi, optimista módosításhoz), újraszámolt csoporttal."""
+    if today_ord is None:
+        today_ord = date.today().toordinal()
+    return _build(task.id, task.title, status, task.due_ord, task.priority, task.plan_id, today_ord,
+                  bucket_id=task.bucket_id, order_hint=task.order_hint, assignee_ids=task.assignee_ids)
+
+
+def _build(task_id: str, title: str, status: Status, due_ord: int | None, priority: Priority,
+           plan_id: str | None, today_ord: int, bucket_id: str | None = None, order_hint: str = "",
+           assignee_ids: tuple = ()) -> TaskViewModel:
+    tone = tone_for(status, due_ord, today_ord)
+
+    if status == Status.ACTIVE:
+        # Csoporton belül a korábbi határidő előbb (a nap-különbség és a sorszám egy irányba mozog)
+        sort_key = (0, int(tone), due_ord if due_ord is not None else _NO_DUE_SORT, title.lower())
+    else:
+        # Kész feladatok: a legkésőbbi határidő elöl, határidő nélküliek a végén
+        sort_key = (1, 0, -due_ord if due_ord is not None else _NO_DUE_SORT, title.lower())
+
+    return TaskViewModel(
+        id=task_id,
+        title=title,
+        status=status,
+        due_ord=due_ord,
+        priority=priority,
+        plan_id=plan_id,
+        bucket_id=bucket_id,
+        order_hint=order_hint,
+        assignee_ids=assignee_ids,
+        tone=tone,
+        sort_key=sort_key,
+    )
+
+
+def view_models(data: list, today_ord: int | None = None) -> list[TaskViewModel]:
+    if today_ord is None:
+        today_ord = date.today().toordinal()
+    return [view_model(t, today_ord) for t in data]
+
+
+def in_order_ids(current: list, wanted: list) -> set:
+    """A current leghosszabb, a wanted sorrendjével egyező részsorozata: ezeket nem kell mozgatni."""
+    pos = {tid: i for i, tid in enumerate(wanted)}
+    seq = [(pos[tid], tid) for tid in current if tid in pos]
+    tails: list[int] = []
+    tail_at: list[int] = []
+    prev = [-1] * len(seq)
+    for k, (p, _) in enumerate(seq):
+        j = bisect_left(tails, p)
+        prev[k] = tail_at[j - 1] if j else -1
+        if j == len(tails):
+            tails.append(p)
+            tail_at.append(k)
+        else:
+            tails[j] = p
+            tail_at[j] = k
+    keep: set = set()
+    k = tail_at[-1] if tail_at else -1
+    while k >= 0:
+        keep.add(seq[k][1])
+        k = prev[k]
+    return keep
+
+
+class TaskIndex:
+    """Feladatok terv szerint; a rendezett listából frissítésenként egyszer épül.
+
+    A csoportokon belül megmarad a bemenet sorrendje.
+    """
+
+    def __init__(self) -> None:
+        self.by_plan: dict[str | None, list[TaskViewModel]] = {}
+
+    def rebuild(self, tasks: list[TaskViewModel]) -> None:
+        by_plan: dict[str | None, list[TaskViewModel]] = {}
+        for t in tasks:
+            by_plan.setdefault(t.plan_id, []).append(t)
+        self.by_plan = by_plan
+
+    def clear(self) -> None:
+        self.by_plan = {}
+
+    def plan_ids(self) -> list[str | None]:
+        return list(self.by_plan)
+
+    def tasks_in_plan(self, plan_id: str | None) -> list[TaskViewModel]:
+        return self.by_plan.get(plan_id, [])
@@ -0,0 +1,145 @@
+# task_search.py
+# Inkrementálisan karbantartott keresőindex a feladatcímekhez (Qt nélkül).
+# Normalizálás: kisbetű + ékezetmentesítés (á->a, ő->o, ű->u ...), szavakra bontás.
+# Szavanként trigram és 1-2 betűs előtag index (1-2 betű: szókezdet, 3+: részszó egyezés);
+# frissítéskor csak a változott címek indexelődnek újra.
+from __future__ import annotations
+
+import re
+import unicodedata
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fold(text: str) -> str:
+    """Kisbetűs, ékezet nélküli alak (a keresés és az index is ezt használja)."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def _words(folded: str) -> list[str]:
+    return _WORD_RE.findall(folded)
+
+
+def _trigrams(word: str) -> set[str]:
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+class TaskSearchIndex:
+    def __init__(self) -> None:
+        self._titles: dict[str, str] = {}       # task_id -> eredeti cím
+        self._folded: dict[str, str] = {}       # task_id -> normalizált cím
+        self._grams: dict[str, set[str]] = {}   # trigram / 1-2 betűs előtag -> task_id-k
+        self._last_query: str = ""
+        self._last_result: set[str] | None = None
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def _keys(self, folded: str) -> set[str]:
+        keys: set[str] = set()
+        for w in _words(folded):
+            keys.add("^" + w[:1])
+            if len(w) >= 2:
+                keys.add("^" + w[:2])
+            keys |= _trigrams(w)
+        return keys
+
+    def _add(self, task_id: str, title: str) -> None:
+        folded = fold(title)
+        self._titles[task_id] = title
+        self._folded[task_id] = folded
+        for k in self._keys(folded):
+            self._grams.setdefault(k, set()).add(task_id)
+
+    def remove(self, task_id: str) -> None:
+        folded = self._folded.pop(task_id, None)
+        self._titles.pop(task_id, None)
+        if folded is None:
+            return
+        for k in self._keys(folded):
+            ids = self._grams.get(k)
+            if ids is not None:
+                ids.discard(task_id)
+                if not ids:
+                    del self._grams[k]
+
+    def upsert(self, task_id: str, title: str) -> None:
+        if self._titles.get(task_id) == title:
+            return
+        self.remove(task_id)
+        self._add(task_id, title)
+
+    def sync(self, tasks) -> int:
+        """Az index igazítása a teljes feladatlistához (id, title attribútumok); a változások száma."""
+        live = {}
+        for t in tasks:
+            live[t.id] = t.title
+        changed = 0
+        for tid in [tid for tid in self._titles if tid not in live]:
+            self.remove(tid)
+            changed += 1
+        for tid, title in live.items():
+            if self._titles.get(tid) != title:
+                self.remove(tid)
+                self._add(tid, title)
+                changed += 1
+        if changed:
+            self._last_query, self._last_result = "", None
+        return changed
+
+    def clear(self) -> None:
+        self._titles.clear()
+        self._folded.clear()
+        self._grams.clear()
+        self._last_query, self._last_result = "", None
+
+    def _candidates(self, word: str) -> set[str]:
+        # Rövid szó: előtag-lista, pontosan 3 betű: trigram-lista; mindkettő pontos találat.
+        # A visszaadott halmaz lehet maga az index bejegyzése: csak olvasni szabad.
+        if len(word) < 3:
+            return self._grams.get("^" + word, set())
+        if len(word) == 3:
+            return self._grams.get(word, set())
+        result: set[str] | None = None
+        # A legritkább trigrammal kezdve a metszet gyorsan szűkül
+        for g in sorted(_trigrams(word), key=lambda g: len(self._grams.get(g, ()))):
+            ids = self._grams.get(g)
+            if not ids:
+                return set()
+            result = set(ids) if result is None else (result & ids)
+            if not result:
+                return set()
+        return result or set()
+
+    def search(self, query: str) -> set[str] | None:
+        """A lekérdezés minden szavát tartalmazó feladatok id-i; None, ha üres a lekérdezés (nincs szűrés)."""
+        q = fold(query).strip()
+        words = _words(q)
+        if not words:
+            self._last_query, self._last_result = "", None
+            return None
+
+        # Gépelés közben (a lekérdezés az előző folytatása) elég az előző találatokat szűrni.
+        # Kivétel, ha egy 1-2 betűs (szókezdet) szó 3+ betűsre (részszó) nő: az bővebb halmaz.
+        pool = None
+        if self._last_result is not None and self._last_query and q.startswith(self._last_query):
+            prev = _words(self._last_query)
+            n = len(prev)
+            if prev[:-1] == words[:n - 1] and (len(prev[-1]) >= 3 or len(words[n - 1]) < 3):
+                pool = self._last_result
+
+        result = pool
+        for w in words:
+            ids = self._candidates(w)
+            result = set(ids) if result is None else (result & ids)
+            if len(w) > 3:
+                # A trigram-metszet csak jelölt: részszó-ellenőrzés a normalizált címen
+                folded = self._folded
+                result = {tid for tid in result if w in folded.get(tid, "")}
+            if not result:
+                result = set()
+                break
+
+        self._last_query, self._last_result = q, result
+        return set(result)
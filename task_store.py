@@ -0,0 +1,195 @@
+# task_store.py
+# Helyi, tartós feladat-tár (SQLite, WAL). A fetch_data eredménye ide fésülődik be,
+# induláskor innen rajzol a widget, mielőtt a Graph válaszolna. A delta szinkron állapota
+# (deltaLink + a nyers feed sorai) is itt van, így frissítéskor csak a változott sorok íródnak.
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from task_model import Status, Priority
+
+TASK_DB_FILE = "tasks.db"
+SCHEMA_VERSION = 4
+
+_local = threading.local()
+_WRITE_LOCK = threading.Lock()
+
+_COLUMNS = ("id", "title", "status", "due_ord", "priority", "plan_id", "bucket_id", "order_hint", "assignee_ids")
+
+
+def _connect() -> sqlite3.Connection:
+    # sqlite3 kapcsolat szálanként (a fetch háttérszálon ír, a UI szál olvas)
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        return conn
+    conn = sqlite3.connect(TASK_DB_FILE, timeout=5.0)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    _ensure_schema(conn)
+    _local.conn = conn
+    return conn
+
+
+def _ensure_schema(conn: sqlite3.Connection) -> None:
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version == SCHEMA_VERSION:
+        return
+    # Ez csak gyorsítótár: eltérő sémánál eldobjuk, a következő szinkron újratölti
+    with conn:
+        conn.execute("DROP TABLE IF EXISTS tasks")
+        conn.execute("DROP TABLE IF EXISTS delta_tasks")
+        conn.execute("DROP TABLE IF EXISTS sync_meta")
+        conn.execute(
+            """
+            CREATE TABLE tasks (
+                id         TEXT PRIMARY KEY,
+                title      TEXT NOT NULL,
+                status     INTEGER NOT NULL,
+                due_ord    INTEGER,
+                priority   INTEGER NOT NULL,
+                plan_id    TEXT,
+                bucket_id  TEXT,
+                order_hint TEXT NOT NULL DEFAULT '',
+                assignee_ids TEXT NOT NULL DEFAULT '',
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX idx_tasks_status ON tasks(status)")
+        conn.execute("CREATE INDEX idx_tasks_due ON tasks(due_ord)")
+        conn.execute("CREATE INDEX idx_tasks_plan ON tasks(plan_id, bucket_id)")
+        conn.execute("CREATE TABLE delta_tasks (id TEXT PRIMARY KEY, body TEXT NOT NULL)")
+        conn.execute("CREATE TABLE sync_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def _row(t: dict) -> tuple:
+    return (
+        str(t.get("id") or ""),
+        str(t.get("title") or ""),
+        int(t.get("status") or Status.ACTIVE),
+        t.get("due_ord"),
+        int(t.get("priority") if t.get("priority") is not None else Priority.MEDIUM),
+        t.get("plan_id") or None,
+        t.get("bucket_id") or None,
+        str(t.get("order_hint") or ""),
+        # A hozzárendelt felhasználók id-i vesszővel elválasztva (az id-kban nincs vessző)
+        ",".join(t.get("assignee_ids") or ()),
+    )
+
+
+def merge_tasks(tasks: list[dict]) -> None:
+    """A teljes (formázott) feladatlista befésülése: változott sorok frissítése, hiányzók törlése."""
+    rows = [_row(t) for t in tasks if t.get("id")]
+    now = time.time()
+    try:
+        with _WRITE_LOCK:
+            conn = _connect()
+            with conn:
+                conn.executemany(
+                    """
+                    INSERT INTO tasks (id, title, status, due_ord, priority, plan_id, bucket_id, order_hint,
+                                       assignee_ids, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        title = excluded.title, status = excluded.status, due_ord = excluded.due_ord,
+                        priority = excluded.priority, plan_id = excluded.plan_id,
+                        bucket_id = excluded.bucket_id, order_hint = excluded.order_hint,
+                        assignee_ids = excluded.assignee_ids, updated_at = excluded.updated_at
+                    WHERE tasks.title IS NOT excluded.title OR tasks.status IS NOT excluded.status
+                       OR tasks.due_ord IS NOT excluded.due_ord OR tasks.priority IS NOT excluded.priority
+                       OR tasks.plan_id IS NOT excluded.plan_id OR tasks.bucket_id IS NOT excluded.bucket_id
+                       OR tasks.order_hint IS NOT excluded.order_hint
+                       OR tasks.assignee_ids IS NOT excluded.assignee_ids
+                    """,
+                    [r + (now,) for r in rows],
+                )
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS live_ids (id TEXT PRIMARY KEY)")
+                conn.execute("DELETE FROM live_ids")
+                conn.executemany("INSERT OR IGNORE INTO live_ids (id) VALUES (?)", [(r[0],) for r in rows])
+                conn.execute("DELETE FROM tasks WHERE id NOT IN (SELECT id FROM live_ids)")
+    except Exception as e:
+        print(f"Task store írási hiba: {e}")
+
+
+def load_tasks() -> list[dict]:
+    """A tárolt feladatok a fetch_data-val azonos formában (üres lista, ha nincs tár)."""
+    if not os.path.exists(TASK_DB_FILE):
+        return []
+    try:
+        rows = _connect().execute(
+            "SELECT id, title, status, due_ord, priority, plan_id, bucket_id, order_hint, assignee_ids "
+            "FROM tasks ORDER BY status, due_ord"
+        ).fetchall()
+    except Exception as e:
+        print(f"Task store olvasási hiba: {e}")
+        return []
+    out = []
+    for r in rows:
+        t = dict(zip(_COLUMNS, r))
+        t["status"] = Status(t["status"])
+        t["priority"] = Priority(t["priority"])
+        t["assignee_ids"] = t["assignee_ids"].split(",") if t["assignee_ids"] else []
+        out.append(t)
+    return out
+
+
+def load_delta() -> tuple[str | None, dict]:
+    """A mentett delta állapot: (deltaLink, {id: nyers feladat}); (None, {}), ha nincs."""
+    if not os.path.exists(TASK_DB_FILE):
+        return None, {}
+    try:
+        conn = _connect()
+        row = conn.execute("SELECT value FROM sync_meta WHERE key = 'deltaLink'").fetchone()
+        if row is None:
+            return None, {}
+        tasks = {tid: json.loads(body) for tid, body in conn.execute("SELECT id, body FROM delta_tasks")}
+    except Exception as e:
+        print(f"Delta állapot olvasási hiba: {e}")
+        return None, {}
+    return row[0], tasks
+
+
+def save_delta(delta_link: str, tasks: dict, changed_ids, replace: bool = False) -> None:
+    """A deltaLink és a changed_ids sorainak mentése egy tranzakcióban.
+
+    A tasks-ból hiányzó id-k törlődnek; replace=True esetén a teljes tárolt feed cserélődik.
+    """
+    ids = list(tasks) if replace else list(changed_ids)
+    upserts = [(tid, json.dumps(tasks[tid], ensure_ascii=False)) for tid in ids if tid in tasks]
+    removed = [(tid,) for tid in ids if tid not in tasks]
+    try:
+        with _WRITE_LOCK:
+            conn = _connect()
+            with conn:
+                if replace:
+                    conn.execute("DELETE FROM delta_tasks")
+                conn.executemany("DELETE FROM delta_tasks WHERE id = ?", removed)
+                conn.executemany(
+                    "INSERT INTO delta_tasks (id, body) VALUES (?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET body = excluded.body",
+                    upserts,
+                )
+                conn.execute(
+                    "INSERT INTO sync_meta (key, value) VALUES ('deltaLink', ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (delta_link,),
+                )
+    except Exception as e:
+        print(f"Delta állapot írási hiba: {e}")
+
+
+def clear() -> None:
+    try:
+        with _WRITE_LOCK:
+            conn = _connect()
+            with conn:
+                conn.execute("DELETE FROM tasks")
+                conn.execute("DELETE FROM delta_tasks")
+                conn.execute("DELETE FROM sync_meta")
+    except Exception as e:
+        print(f"Task store törlési hiba: {e}")
@@ -11,6 +11,13 @@ ANIM_DURATION_MS = 180
 REFRESH_RATE_SECONDS = 300
 ALWAYS_ON_TOP = False
 
+# Ennyi aktív feladattól virtualizált lista (QListView + delegate) rajzol kártya-widgetek helyett.
+# A kész feladatok nem számítanak bele. None: soha, 0: mindig
+VIRTUAL_LIST_THRESHOLD = 1000
+
+# Fejlesztői mérés: szakaszidők a fejlécben + perf_trace.jsonl (PLANNER_PERF=1 is bekapcsolja)
+PERF_TRACE = False
+
 STARTSOUND   = "sound1.wav"
 COMPLETESOUND = "complete.wav"
 REOPENSOUND  = "reopen.wav"